@@ -0,0 +1,50 @@
+# -*- coding: utf8 -*-
+import os
+import re
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.zepp_helper import BAND_DATA_JSON_TEMPLATE, build_band_data_body
+
+
+def legacy_build_band_data_body(step, userid):
+    """优化前 post_fake_brand_data 中构建请求体的逻辑，仅用于对比"""
+    today = time.strftime("%F")
+    data_json = BAND_DATA_JSON_TEMPLATE
+    find_date = re.compile(r".*?date%22%3A%22(.*?)%22%2C%22data.*?")
+    find_step = re.compile(r".*?ttl%5C%22%3A(.*?)%2C%5C%22dis.*?")
+    data_json = re.sub(find_date.findall(data_json)[0], today, str(data_json))
+    data_json = re.sub(find_step.findall(data_json)[0], step, str(data_json))
+    return f'userid={userid}&last_sync_data_time=1597306380&device_type=0&last_deviceid=DA932FFFFE8816E7&data_json={data_json}'
+
+
+def measure(name, func):
+    # 优化前单次调用在秒级，按耗时自动确定调用次数
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call_us = min(timer.repeat(number=number, repeat=3)) / number * 1e6
+    tracemalloc.start()
+    func()
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # 单次调用过程中临时分配的内存峰值
+    allocated = peak - current
+    print(f"{name:<6} 单次耗时：{per_call_us:12.1f}us  单次内存分配峰值：{allocated / 1024:7.1f}KB")
+    return per_call_us
+
+
+if __name__ == "__main__":
+    """
+    对比 post_fake_brand_data 请求体构建的耗时和内存分配
+    python benchmark/bench_band_data.py
+    """
+    legacy = measure("优化前", lambda: legacy_build_band_data_body("18888", 1188760659))
+    current = measure("优化后", lambda: build_band_data_body("18888", 1188760659))
+    print(f"提速 {legacy / current:.1f} 倍")
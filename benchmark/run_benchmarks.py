@@ -0,0 +1,199 @@
+# -*- coding: utf8 -*-
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from util import aes_help, push_util
+from util.account_result import AccountResult
+from util.zepp_helper import build_band_data_body
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+# 仓库中的参考基线，和运行机器无关的比较只用于展示，不会使退出码为1
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+# 在本机生成的基线，不提交到仓库，存在时才判断性能回退
+LOCAL_BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.local.json")
+# 比基线慢超过这个比例视为性能回退
+DEFAULT_THRESHOLD = 0.25
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """注册基准测试，被装饰的函数负责准备数据并返回需要计时的无参函数"""
+    def decorator(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return decorator
+
+
+def fake_token_info(idx) -> dict:
+    return {
+        "access_token": "a" * 120,
+        "login_token": "l" * 150,
+        "app_token": "t" * 150,
+        "user_id": str(1100000000 + idx),
+        "access_token_time": "1760000000000",
+        "login_token_time": "1760000000000",
+        "app_token_time": "1760000000000",
+        "device_id": "00000000-0000-0000-0000-%012d" % idx,
+    }
+
+
+def fake_token_blob(account_count) -> bytes:
+    tokens = {f"+86138{idx:08d}": fake_token_info(idx) for idx in range(account_count)}
+    return json.dumps(tokens, ensure_ascii=False).encode("utf-8")
+
+
+def fake_exec_results(count) -> list:
+    return [AccountResult(f"138{idx:08d}", idx % 7 != 0, f"修改步数（{18000 + idx}）[success]")
+            for idx in range(count)]
+
+
+AES_KEY = b"0123456789abcdef"
+for _account_count in (1, 100, 1000):
+    def _encrypt_setup(account_count=_account_count):
+        plain = fake_token_blob(account_count)
+        return lambda: aes_help.encrypt_data(plain, AES_KEY, None)
+
+    def _decrypt_setup(account_count=_account_count):
+        cipher = aes_help.encrypt_data(fake_token_blob(account_count), AES_KEY, None)
+        return lambda: aes_help.decrypt_data(cipher, AES_KEY, None)
+
+    benchmark(f"aes_encrypt_tokens_{_account_count}")(_encrypt_setup)
+    benchmark(f"aes_decrypt_tokens_{_account_count}")(_decrypt_setup)
+
+
+@benchmark("build_band_data_body")
+def _band_data_setup():
+    return lambda: build_band_data_body("18888", 1188760659, "2025-01-01")
+
+
+for _result_count in (10, 100, 1000, 10000):
+    def _content_setup(result_count=_result_count):
+        results = fake_exec_results(result_count)
+        summary = f"\n执行账号总数{result_count}，成功：{result_count}，失败：0 步数范围：18000-25000"
+        return lambda: push_util.generate_unified_content(results, summary)
+
+    benchmark(f"generate_unified_content_{_result_count}")(_content_setup)
+
+
+@benchmark("get_min_max_by_time")
+def _min_max_setup():
+    main.config = {"MIN_STEP": "18000", "MAX_STEP": "25000",
+                   "HOUR_STEP_RANGES": "[[0, 8, 1000, 3000], [8, 12, 5000, 9000], [20, 24, 18000, 25000]]"}
+    main.time_bj = main.get_beijing_time()
+    return lambda: main.get_min_max_by_time(14, 30)
+
+
+@benchmark("parse_config")
+def _parse_config_setup():
+    raw_config = json.dumps({
+        "USER": "#".join(f"138{idx:08d}" for idx in range(100)),
+        "PWD": "#".join(f"pwd{idx}" for idx in range(100)),
+        "MIN_STEP": "18000", "MAX_STEP": "25000",
+        "PUSH_PLUS_TOKEN": "", "PUSH_PLUS_HOUR": "", "PUSH_PLUS_MAX": "30",
+        "SLEEP_GAP": "5", "USE_CONCURRENT": "False",
+    })
+
+    def parse():
+        config = dict(json.loads(raw_config))
+        main.build_push_config(config)
+        return config.get('USER').split('#'), config.get('PWD').split('#')
+
+    return parse
+
+
+def calibration_loop():
+    # 固定的纯Python计算，基准测试耗时换算为它的倍数，抵消机器快慢以及CPU频率变化的影响
+    total = 0
+    for i in range(10000):
+        total += i * i % 7
+    return total
+
+
+def measure(func, repeat) -> (float, float):
+    """
+    返回单次调用耗时(秒)以及相对校准计算的耗时倍数
+    每一轮先后执行校准计算和基准测试，各取多轮中最快的一轮以降低噪声
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    calibration_timer = timeit.Timer(calibration_loop)
+    calibration_number, _ = calibration_timer.autorange()
+    rounds, calibration_rounds = [], []
+    for _ in range(repeat):
+        calibration_rounds.append(calibration_timer.timeit(calibration_number) / calibration_number)
+        rounds.append(timer.timeit(number) / number)
+    return min(rounds), min(rounds) / min(calibration_rounds)
+
+
+def load_baseline(path) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path, results):
+    data = {
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def run(cli_args) -> int:
+    local = os.path.exists(LOCAL_BASELINE_PATH)
+    baseline = load_baseline(LOCAL_BASELINE_PATH if local else BASELINE_PATH)
+    if not local:
+        print("没有本机基线，和参考基线的对比只用于展示，执行 --save-baseline 生成本机基线后才判断性能回退")
+    results = {}
+    regressions = []
+    for name, setup in BENCHMARKS:
+        if cli_args.filter and cli_args.filter not in name:
+            continue
+        seconds, relative = measure(setup(), cli_args.repeat)
+        results[name] = {"seconds": seconds, "relative": relative}
+        base = baseline.get(name)
+        if isinstance(base, dict):
+            # 比较相对校准计算的倍数，不受机器快慢影响
+            ratio = relative / base["relative"] - 1
+            flag = ""
+            if ratio > cli_args.threshold:
+                flag = "  <-- 性能回退" if local else "  <-- 比参考基线慢"
+                regressions.append(name)
+            print(f"{name:<32} {seconds * 1e6:>12.2f}us  基线:{base['seconds'] * 1e6:>12.2f}us  "
+                  f"相对耗时{ratio:+7.1%}{flag}")
+        else:
+            print(f"{name:<32} {seconds * 1e6:>12.2f}us  基线:无")
+    if cli_args.save_baseline:
+        save_baseline(LOCAL_BASELINE_PATH, {**baseline, **results} if local else results)
+        print(f"已保存本机基线：{LOCAL_BASELINE_PATH}")
+    if regressions:
+        print(f"以下基准测试的相对耗时比基线高超过{cli_args.threshold:.0%}：{', '.join(regressions)}")
+        return 1 if local else 0
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    离线运行每个账号/每次执行中CPU部分的基准测试，并和保存的基线对比
+    python benchmark/run_benchmarks.py                  对比基线，和本机基线相比出现回退时退出码为1
+    python benchmark/run_benchmarks.py --save-baseline  生成或更新本机基线
+    """
+    parser = argparse.ArgumentParser(description="mimotion 基准测试")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="允许比基线慢的比例，默认0.25")
+    parser.add_argument("--repeat", type=int, default=5, help="每个基准测试的重复轮数")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的基准测试")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为本机基线")
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,99 @@
+# -*- coding: utf8 -*-
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动时不导入、首次用到时才导入的模块，单独统计它们推迟的耗时
+DEFERRED_IMPORTS = {
+    "requests": "import requests",
+    "Crypto.Cipher.AES": "from Crypto.Cipher import AES",
+}
+
+
+def run_python(code, importtime=False) -> (float, str):
+    """在新进程中执行代码，返回耗时(秒)以及 -X importtime 的输出"""
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", code]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return elapsed, proc.stderr
+
+
+def parse_importtime(output) -> dict:
+    """解析 -X importtime 输出，返回 模块 -> (自身耗时us, 累计耗时us, 嵌套层级)"""
+    modules = dict()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def deferred_import_time(code, statement) -> float:
+    """在已经执行完code的进程内为导入语句计时，不受两次启动进程之间耗时波动的影响，结果不会为负"""
+    timed = f"{code}\nimport time\n_start = time.perf_counter()\n{statement}\nprint(time.perf_counter() - _start)"
+    proc = subprocess.run([sys.executable, "-c", timed], cwd=ROOT_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def median_wall_time(code, repeat) -> float:
+    return statistics.median(run_python(code)[0] for _ in range(repeat))
+
+
+def report(cli_args):
+    code = f"import {cli_args.module}"
+    baseline = median_wall_time("pass", cli_args.repeat)
+    wall = median_wall_time(code, cli_args.repeat)
+    print(f"解释器启动：{baseline * 1000:8.1f}ms")
+    print(f"import {cli_args.module}：{wall * 1000:8.1f}ms（不含解释器启动 {max(wall - baseline, 0) * 1000:.1f}ms）")
+
+    runs = [parse_importtime(run_python(code, importtime=True)[1]) for _ in range(cli_args.repeat)]
+    names = set().union(*runs)
+    merged = {name: (statistics.median(run[name][0] for run in runs if name in run),
+                     statistics.median(run[name][1] for run in runs if name in run),
+                     min(run[name][2] for run in runs if name in run))
+              for name in names}
+
+    print(f"\n顶层导入累计耗时（前{cli_args.top}，单位ms）：")
+    top_level = sorted((item for item in merged.items() if item[1][2] <= 1), key=lambda item: -item[1][1])
+    for name, (self_us, cumulative_us, _) in top_level[:cli_args.top]:
+        print(f"  {name:<40} {cumulative_us / 1000:8.2f}")
+
+    print(f"\n模块自身耗时（前{cli_args.top}，单位ms）：")
+    for name, (self_us, _, _) in sorted(merged.items(), key=lambda item: -item[1][0])[:cli_args.top]:
+        print(f"  {name:<40} {self_us / 1000:8.2f}")
+
+    print("\n推迟到首次使用时导入的模块：")
+    for name, statement in DEFERRED_IMPORTS.items():
+        if name in merged:
+            print(f"  {name:<40} 启动时已被导入，检查是否有模块在顶层导入了它")
+            continue
+        deferred = statistics.median(deferred_import_time(code, statement) for _ in range(cli_args.repeat))
+        print(f"  {name:<40} {deferred * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    """
+    统计 main.py 的冷启动耗时，每次都在新进程中导入以避免缓存影响
+    python benchmark/startup_report.py
+    python benchmark/startup_report.py --module util.zepp_helper --top 10
+    """
+    parser = argparse.ArgumentParser(description="mimotion 启动耗时报告")
+    parser.add_argument("--module", default="main", help="需要统计的模块，默认为main")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数，取中位数")
+    parser.add_argument("--top", type=int, default=15, help="展示耗时最多的前n个模块")
+    report(parser.parse_args())
@@ -0,0 +1,94 @@
+# -*- coding: utf8 -*-
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import MAIN_PATH, MOCK_SERVER_PATH, free_port
+
+# 仅用于本地检查的AES_KEY
+CHECK_AES_KEY = "0123456789abcdef"
+TOKEN_FILE = "encrypted_tokens.data"
+POSTED_FILE = "posted_steps.data"
+
+
+def file_digest(path) -> str | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def run_main(work_dir, base_url, account_count, skip_posted) -> str:
+    config = {
+        "USER": "#".join(f"{i}@t" for i in range(account_count)),
+        "PWD": "#".join("p" for _ in range(account_count)),
+        "SLEEP_GAP": "0",
+        "SKIP_POSTED_STEP": "True" if skip_posted else "False",
+    }
+    env = dict(os.environ, CONFIG=json.dumps(config), AES_KEY=CHECK_AES_KEY, ZEPP_API_BASE=base_url)
+    proc = subprocess.run([sys.executable, MAIN_PATH], cwd=work_dir, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if proc.returncode != 0:
+        print(proc.stdout)
+        raise RuntimeError(f"main.py 退出码：{proc.returncode}")
+    return proc.stdout
+
+
+def check(account_count) -> list:
+    """返回检查失败的说明，为空表示通过"""
+    port = free_port()
+    server = subprocess.Popen([sys.executable, MOCK_SERVER_PATH, "--port", str(port), "--latency", "fixed:5"],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    server.stdout.readline()
+    base_url = f"http://127.0.0.1:{port}"
+    failures = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="mimotion_persist_") as work_dir:
+            token_path = os.path.join(work_dir, TOKEN_FILE)
+            posted_path = os.path.join(work_dir, POSTED_FILE)
+            # 第一次执行使用密码登录并保存token
+            run_main(work_dir, base_url, account_count, skip_posted=False)
+            token_digest = file_digest(token_path)
+            if token_digest is None:
+                return [f"第一次执行后没有生成{TOKEN_FILE}"]
+            # 第二次执行app_token均签发不久，直接使用并再次提交步数，token文件不应变化
+            output = run_main(work_dir, base_url, account_count, skip_posted=False)
+            if file_digest(token_path) != token_digest:
+                failures.append(f"只提交步数的执行改变了{TOKEN_FILE}")
+            if "没有账号的token发生变化" not in output:
+                failures.append("只提交步数的执行报告了token变化")
+            # 第三次执行今天已提交，全部跳过，两个文件都不应变化
+            posted_digest = file_digest(posted_path)
+            output = run_main(work_dir, base_url, account_count, skip_posted=True)
+            if file_digest(token_path) != token_digest:
+                failures.append(f"全部跳过的执行改变了{TOKEN_FILE}")
+            if file_digest(posted_path) != posted_digest:
+                failures.append(f"全部跳过的执行改变了{POSTED_FILE}")
+            if "其中今天已提交跳过" not in output:
+                failures.append("第三次执行没有跳过今天已提交的账号")
+    finally:
+        server.terminate()
+        server.wait()
+    return failures
+
+
+if __name__ == "__main__":
+    """
+    检查token没有变化的执行不会改写token文件，避免每次执行都产生新的提交
+    使用本地模拟服务连续执行三次 main.py：密码登录、信任app_token后再次提交、今天已提交全部跳过
+    python local/check_token_persistence.py --accounts 5
+    """
+    parser = argparse.ArgumentParser(description="检查token文件在token没有变化时保持不变")
+    parser.add_argument("--accounts", type=int, default=5, help="账号数量")
+    failures = check(parser.parse_args().accounts)
+    for failure in failures:
+        print(f"检查失败：{failure}")
+    if failures:
+        exit(1)
+    print("检查通过：token没有变化时token文件保持不变")
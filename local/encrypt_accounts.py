@@ -0,0 +1,41 @@
+# -*- coding: utf8 -*-
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.account_source import AccountSource, ACCOUNT_FILE_HEADER, encrypt_record
+
+
+def encrypt_accounts(source_path, output_path, aes_key) -> int:
+    """逐条读取明文账号文件并逐条加密写入，返回写入的账号数"""
+    count = 0
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(ACCOUNT_FILE_HEADER + '\n')
+        for account in AccountSource(path=source_path):
+            record = {"user": account.user, "pwd": account.password}
+            if account.step_range is not None:
+                record["min_step"], record["max_step"] = account.step_range
+            f.write(encrypt_record(record, aes_key) + '\n')
+            count += 1
+    os.replace(tmp_path, output_path)
+    return count
+
+
+if __name__ == "__main__":
+    """
+    将JSON Lines/CSV格式的明文账号文件加密，加密后的文件可以提交到仓库并配置为 ACCOUNT_FILE
+    AES_KEY=xxxxxxxxxxxxxxxx python local/encrypt_accounts.py accounts.jsonl accounts.enc
+    """
+    parser = argparse.ArgumentParser(description="加密账号文件")
+    parser.add_argument("source", help="明文账号文件，.jsonl 或 .csv")
+    parser.add_argument("output", help="加密后的账号文件")
+    cli_args = parser.parse_args()
+    key = os.environ.get("AES_KEY", "").encode('utf-8')
+    if len(key) != 16:
+        print("请通过环境变量 AES_KEY 指定16个字符的密钥，需要和执行时使用的AES_KEY一致")
+        sys.exit(1)
+    written = encrypt_accounts(cli_args.source, cli_args.output, key)
+    print(f"已加密{written}个账号到{cli_args.output}")
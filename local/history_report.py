@@ -0,0 +1,25 @@
+# -*- coding: utf8 -*-
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.run_history import RunHistory
+
+if __name__ == "__main__":
+    """
+    查看执行记录数据库中的成功率、耗时趋势、最慢的账号以及经常需要重新登录的账号
+    数据库路径为CONFIG中配置的 RUN_HISTORY_DB，只在本地保存，Github Actions中的执行不会累积记录
+    python local/history_report.py run_history.db
+    python local/history_report.py run_history.db --runs 50 --top 20
+    """
+    parser = argparse.ArgumentParser(description="mimotion 执行记录报告")
+    parser.add_argument("db", help="执行记录数据库路径")
+    parser.add_argument("--runs", type=int, default=20, help="统计最近n次执行")
+    parser.add_argument("--top", type=int, default=10, help="最慢账号以及重新登录账号展示的数量")
+    cli_args = parser.parse_args()
+    if not os.path.exists(cli_args.db):
+        print(f"{cli_args.db} 不存在，请先在CONFIG中配置 RUN_HISTORY_DB 并执行一次")
+        exit(1)
+    print(RunHistory(cli_args.db).report(cli_args.runs, cli_args.top))
@@ -0,0 +1,149 @@
+# -*- coding: utf8 -*-
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(ROOT_DIR, "main.py")
+MOCK_SERVER_PATH = os.path.join(ROOT_DIR, "local", "mock_zepp_server.py")
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, pct) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return values[idx]
+
+
+def mock_api(base_url, path) -> dict:
+    with urllib.request.urlopen(f"{base_url}{path}", timeout=10) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def start_mock_server(port, cli_args) -> subprocess.Popen:
+    cmd = [sys.executable, MOCK_SERVER_PATH, "--port", str(port),
+           "--latency", cli_args.latency,
+           "--error-rate", str(cli_args.error_rate),
+           "--app-token-ttl", str(cli_args.app_token_ttl),
+           "--login-token-ttl", str(cli_args.login_token_ttl),
+           "--access-token-ttl", str(cli_args.access_token_ttl)]
+    server = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    # 等待模拟服务启动完成
+    server.stdout.readline()
+    return server
+
+
+def build_config(account_count, work_dir, cli_args) -> dict:
+    config = {
+        "MIN_STEP": "18000",
+        "MAX_STEP": "25000",
+        "SLEEP_GAP": "0",
+    }
+    if cli_args.account_file:
+        # 账号写入JSON Lines文件，账号数不受环境变量长度限制
+        account_path = os.path.join(work_dir, f"accounts_{account_count}.jsonl")
+        with open(account_path, "w", encoding="utf-8") as f:
+            for i in range(account_count):
+                f.write(json.dumps({"user": f"{i}@t", "pwd": "p"}) + "\n")
+        config["ACCOUNT_FILE"] = account_path
+    else:
+        # 账号尽量短，避免CONFIG超过单个环境变量的长度限制
+        config["USER"] = "#".join(f"{i}@t" for i in range(account_count))
+        config["PWD"] = "#".join("p" for _ in range(account_count))
+    if cli_args.mode == "thread":
+        config["USE_CONCURRENT"] = "True"
+    if cli_args.concurrency:
+        config["MAX_CONCURRENCY"] = str(cli_args.concurrency)
+    if cli_args.adaptive:
+        config["ADAPTIVE_CONCURRENCY"] = "True"
+    return config
+
+
+def run_main(account_count, base_url, work_dir, cli_args) -> (float, int, int):
+    """运行一次 main.py，返回耗时、峰值内存(KB)以及退出码"""
+    env = dict(os.environ)
+    env.pop("AES_KEY", None)
+    env["CONFIG"] = json.dumps(build_config(account_count, work_dir, cli_args))
+    env["ZEPP_API_BASE"] = base_url
+    log_path = os.path.join(work_dir, f"main_{account_count}.log")
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, MAIN_PATH], cwd=work_dir, env=env,
+                                stdout=log_file, stderr=subprocess.STDOUT)
+        # 使用wait4获取子进程自身的资源占用，ru_maxrss在Linux下单位为KB
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        elapsed = time.perf_counter() - start
+    return elapsed, rusage.ru_maxrss, proc.returncode
+
+
+def run_load_test(cli_args):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_mock_server(port, cli_args)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="mimotion_load_") as work_dir:
+            for account_count in cli_args.accounts:
+                mock_api(base_url, "/__reset")
+                elapsed, max_rss, code = run_main(account_count, base_url, work_dir, cli_args)
+                stats = mock_api(base_url, "/__stats")
+                latencies = stats["account_latencies"]
+                result = {
+                    "accounts": account_count,
+                    "completed": len(latencies),
+                    "exit_code": code,
+                    "elapsed": round(elapsed, 3),
+                    "throughput": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0,
+                    "p50": round(percentile(latencies, 50) * 1000, 1),
+                    "p99": round(percentile(latencies, 99) * 1000, 1),
+                    "peak_rss_mb": round(max_rss / 1024, 1),
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                }
+                results.append(result)
+                print(f"账号数:{account_count:>6} 完成:{result['completed']:>6} 耗时:{result['elapsed']:>8.2f}s "
+                      f"吞吐:{result['throughput']:>8.2f}个/s p50:{result['p50']:>8.1f}ms p99:{result['p99']:>8.1f}ms "
+                      f"峰值内存:{result['peak_rss_mb']:>7.1f}MB 退出码:{code}", flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+    if cli_args.output:
+        with open(cli_args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    """
+    使用本地模拟服务对 main.py 进行端到端压测
+    python local/load_test.py --accounts 100,1000,10000 --mode thread --concurrency 64
+    """
+    parser = argparse.ArgumentParser(description="mimotion 端到端压测")
+    parser.add_argument("--accounts", default="100,1000,10000",
+                        type=lambda v: [int(x) for x in v.split(",") if x.strip()],
+                        help="逗号分隔的账号数量，每个数量运行一次")
+    parser.add_argument("--mode", choices=["serial", "thread"], default="thread")
+    parser.add_argument("--concurrency", type=int, default=0, help="MAX_CONCURRENCY，0为使用默认值")
+    parser.add_argument("--adaptive", action="store_true", help="开启 ADAPTIVE_CONCURRENCY")
+    parser.add_argument("--account-file", action="store_true", help="通过 ACCOUNT_FILE 传入账号，而不是CONFIG中的USER/PWD")
+    parser.add_argument("--latency", default="lognormal:50:0.5", help="模拟服务延迟分布")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--access-token-ttl", type=float, default=0)
+    parser.add_argument("--login-token-ttl", type=float, default=0)
+    parser.add_argument("--app-token-ttl", type=float, default=0)
+    parser.add_argument("--output", help="将结果以JSON格式写入该文件")
+    run_load_test(parser.parse_args())
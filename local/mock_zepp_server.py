@@ -0,0 +1,263 @@
+# -*- coding: utf8 -*-
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.aes_help import decrypt_data, HM_AES_KEY, HM_AES_IV
+
+
+class LatencyModel:
+    """
+    接口响应延迟分布，格式为 类型:参数，单位毫秒
+      - fixed:20 固定20ms
+      - uniform:10:100 10到100ms均匀分布
+      - lognormal:50:0.5 中位数50ms，sigma为0.5的对数正态分布
+    """
+
+    def __init__(self, spec):
+        parts = spec.split(":")
+        self.kind = parts[0]
+        self.args = [float(x) for x in parts[1:]]
+        if self.kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"不支持的延迟分布：{spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.args[0] / 1000
+        if self.kind == "uniform":
+            return random.uniform(self.args[0], self.args[1]) / 1000
+        median, sigma = self.args
+        return random.lognormvariate(0, sigma) * median / 1000
+
+
+class MockState:
+    """模拟服务端保存的token以及压测统计数据"""
+
+    def __init__(self, args):
+        self.latency = LatencyModel(args.latency)
+        self.error_rate = args.error_rate
+        self.ttl = {
+            "access": args.access_token_ttl,
+            "login": args.login_token_ttl,
+            "app": args.app_token_ttl,
+        }
+        self.lock = threading.Lock()
+        # token -> (账号, 签发时间)
+        self.tokens = {"access": {}, "login": {}, "app": {}}
+        self.user_ids = {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.errors = {}
+            self.first_seen = {}
+            self.account_latencies = []
+            self.started = time.time()
+
+    def issue(self, kind, user) -> str:
+        token = f"{kind}-{uuid.uuid4().hex}"
+        with self.lock:
+            self.tokens[kind][token] = (user, time.time())
+            if user not in self.user_ids:
+                self.user_ids[user] = str(100000000 + len(self.user_ids))
+        return token
+
+    def lookup(self, kind, token) -> str | None:
+        """返回token对应的账号，token不存在或已过期时返回None"""
+        with self.lock:
+            entry = self.tokens[kind].get(token)
+        if entry is None:
+            return None
+        user, issued = entry
+        if self.ttl[kind] > 0 and time.time() - issued > self.ttl[kind]:
+            return None
+        return user
+
+    def user_id(self, user) -> str:
+        with self.lock:
+            return self.user_ids[user]
+
+    def count(self, endpoint, error=False):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            if error:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def touch(self, user):
+        """记录账号第一次请求的时间，用于统计单账号耗时"""
+        if user is None:
+            return
+        with self.lock:
+            self.first_seen.setdefault(user, time.time())
+
+    def finish(self, user):
+        with self.lock:
+            started = self.first_seen.pop(user, None)
+            if started is not None:
+                self.account_latencies.append(time.time() - started)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "errors": dict(self.errors),
+                "account_latencies": list(self.account_latencies),
+                "elapsed": time.time() - self.started,
+            }
+
+
+def build_handler(state: MockState):
+    class MockZeppHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send_json(self, data, status=200, headers=None):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _simulate(self, endpoint) -> bool:
+            """模拟延迟和随机错误，返回是否已经响应了错误"""
+            time.sleep(state.latency.sample())
+            if state.error_rate > 0 and random.random() < state.error_rate:
+                state.count(endpoint, error=True)
+                self._send_json({"message": "mock server error"}, status=500)
+                return True
+            state.count(endpoint)
+            return False
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _dispatch(self, method):
+            parts = urlsplit(self.path)
+            path, query = parts.path, parse_qs(parts.query)
+            body = self._read_body() if method == "POST" else b""
+            if path == "/__stats":
+                return self._send_json(state.stats())
+            if path == "/__reset":
+                state.reset()
+                return self._send_json({"ok": True})
+            for suffix, handler in ROUTES:
+                if path.endswith(suffix):
+                    if self._simulate(suffix):
+                        return
+                    return handler(self, query, body)
+            self._send_json({"message": f"unknown path {path}"}, status=404)
+
+        def registrations_tokens(self, query, body):
+            form = parse_qs(decrypt_data(body, HM_AES_KEY, HM_AES_IV).decode("utf-8"))
+            user = form.get("emailOrPhone", [""])[0]
+            state.touch(user)
+            if not form.get("password", [""])[0]:
+                location = "https://s3-us-west-2.amazonaws.com/hm-registration/successsignin.html?error=0106&"
+            else:
+                code = state.issue("access", user)
+                location = f"https://s3-us-west-2.amazonaws.com/hm-registration/successsignin.html?access={code}&country_code=CN"
+            self._send_json({}, status=303, headers={"Location": location})
+
+        def client_login(self, query, body):
+            form = parse_qs(body.decode("utf-8"))
+            user = state.lookup("access", form.get("code", [""])[0])
+            if user is None:
+                return self._send_json({"result": "error", "error_code": "0106"})
+            state.touch(user)
+            self._send_json({"result": "ok", "token_info": {
+                "login_token": state.issue("login", user),
+                "app_token": state.issue("app", user),
+                "user_id": state.user_id(user),
+            }})
+
+        def app_tokens(self, query, body):
+            user = state.lookup("login", query.get("login_token", [""])[0])
+            if user is None:
+                return self._send_json({"result": "error", "error_code": "0115"})
+            state.touch(user)
+            self._send_json({"result": "ok", "token_info": {"app_token": state.issue("app", user)}})
+
+        def renew_login_token(self, query, body):
+            user = state.lookup("login", query.get("login_token", [""])[0])
+            if user is None:
+                return self._send_json({"result": "error"})
+            state.touch(user)
+            self._send_json({"result": "ok", "token_info": {"login_token": state.issue("login", user)}})
+
+        def get_user_info(self, query, body):
+            user = state.lookup("app", self.headers.get("apptoken", ""))
+            if user is None:
+                return self._send_json({"message": "invalid token"})
+            state.touch(user)
+            self._send_json({"message": "success"})
+
+        def band_data(self, query, body):
+            user = state.lookup("app", self.headers.get("apptoken", ""))
+            if user is None:
+                return self._send_json({"message": "invalid token"})
+            state.finish(user)
+            self._send_json({"message": "success"})
+
+    ROUTES = [
+        ("/v2/registrations/tokens", MockZeppHandler.registrations_tokens),
+        ("/v2/client/login", MockZeppHandler.client_login),
+        ("/v1/client/app_tokens", MockZeppHandler.app_tokens),
+        ("/v1/client/renew_login_token", MockZeppHandler.renew_login_token),
+        ("/huami.health.getUserInfo.json", MockZeppHandler.get_user_info),
+        ("/v1/data/band_data.json", MockZeppHandler.band_data),
+    ]
+    return MockZeppHandler
+
+
+class MockZeppServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 压测时会有大量并发连接，调大监听队列
+    request_queue_size = 1024
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="本地模拟华米/Zepp接口，用于压测和回归验证")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", default="lognormal:50:0.5", help="延迟分布 fixed:ms / uniform:min:max / lognormal:median:sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回500的概率")
+    parser.add_argument("--access-token-ttl", type=float, default=0, help="access_token有效期(秒)，0为不过期")
+    parser.add_argument("--login-token-ttl", type=float, default=0, help="login_token有效期(秒)，0为不过期")
+    parser.add_argument("--app-token-ttl", type=float, default=0, help="app_token有效期(秒)，0为不过期")
+    return parser
+
+
+if __name__ == "__main__":
+    """
+    启动本地模拟服务，然后配置环境变量 ZEPP_API_BASE=http://127.0.0.1:18080 运行 main.py
+    GET /__stats 获取请求统计，GET /__reset 清空统计
+    """
+    cli_args = build_arg_parser().parse_args()
+    server = MockZeppServer((cli_args.host, cli_args.port), build_handler(MockState(cli_args)))
+    print(f"模拟服务已启动：http://{cli_args.host}:{cli_args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
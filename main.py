@@ -1,19 +1,49 @@
 # -*- coding: utf8 -*-
+import argparse
 import math
+import sys
 import traceback
-from datetime import datetime
-import pytz
 import uuid
 
 import json
 import random
-import re
+import signal
+import threading
 import time
 import os
 
-from util.aes_help import encrypt_data, decrypt_data
 import util.zepp_helper as zeppHelper
 import util.push_util as push_util
+import util.sharding as sharding
+from util.token_store import TokenStore, STORE_HEADER
+from util.run_journal import RunJournal
+from util.account_result import AccountResult, classify_exception, ERROR_INVALID_CONFIG, ERROR_LOGIN, ERROR_POST, \
+    ERROR_DEADLINE
+from util.run_logger import RunLogger
+from util.push_outbox import PushOutbox
+from util.deadline import Deadline
+from util.token_lifecycle import TokenLifecycle
+from util.cost_planner import CostPlanner, account_stages
+from util.run_metrics import RunMetrics
+from util.account_source import open_account_source
+from util.clock import get_beijing_time, format_now, get_time
+
+# 加密保存token的文件，分片执行时每个分片使用单独的文件
+TOKEN_DATA_PATH = r"encrypted_tokens.data"
+# 加密保存每个账号今天已提交的步数，和token分开保存，只提交步数时token文件保持不变
+POSTED_STEP_PATH = r"posted_steps.data"
+POSTED_STEP_HEADER = "MIMOTION-POSTED-STEPS-V1"
+# 加密保存的执行日志，执行被中断后使用 --resume 续跑
+RUN_JOURNAL_PATH = r"run_journal.data"
+# 加密保存的推送队列，推送失败的报告下次执行时重新推送
+PUSH_OUTBOX_PATH = r"push_outbox.data"
+# 各接口阶段的历史平均耗时，用于预测账号耗时并安排执行顺序
+STAGE_LATENCY_PATH = r"stage_latency.json"
+# 单个账号最多保留的日志行数
+MAX_LOG_LINES = 50
+# 执行时限中预留给保存token、推送以及提交token文件的时间(秒)
+DEADLINE_RESERVE = 60
+
 
 # 获取默认值转int
 def get_int_value_default(_config: dict, _key, default):
@@ -21,23 +51,37 @@ def get_int_value_default(_config: dict, _key, default):
     return int(_config.get(_key))
 
 
-# 获取当前时间对应的最大和最小步数
-def get_min_max_by_time(hour=None, minute=None):
+# 根据CONFIG创建推送配置对象
+def build_push_config(_config: dict) -> push_util.PushConfig:
+    return push_util.PushConfig(
+        push_plus_token=_config.get('PUSH_PLUS_TOKEN'),
+        push_plus_hour=_config.get('PUSH_PLUS_HOUR'),
+        push_plus_max=get_int_value_default(_config, 'PUSH_PLUS_MAX', 30),
+        push_wechat_webhook_key=_config.get('PUSH_WECHAT_WEBHOOK_KEY'),
+        telegram_bot_token=_config.get('TELEGRAM_BOT_TOKEN'),
+        telegram_chat_id=_config.get('TELEGRAM_CHAT_ID'),
+        push_timeout=_config.get('PUSH_TIMEOUT')
+    )
+
+
+# 获取当前时间对应的最大和最小步数，step_range 为单个账号配置的步数范围，替代 MIN_STEP/MAX_STEP
+def get_min_max_by_time(hour=None, minute=None, step_range=None):
     if hour is None:
         hour = time_bj.hour
     if minute is None:
         minute = time_bj.minute
     
-    # 读取并解析 CONFIG 中的时间区间配置
-    hour_step_ranges = json.loads(config.get("HOUR_STEP_RANGES", "[]"))
+    # 读取并解析 CONFIG 中的时间区间配置，单个账号配置了步数范围时不使用
+    hour_step_ranges = json.loads(config.get("HOUR_STEP_RANGES", "[]")) if step_range is None else []
     for start_h, end_h, min_s, max_s in hour_step_ranges:
         if start_h <= hour < end_h:
             return int(min_s), int(max_s)
     
     # 无匹配区间时，沿用原线性逻辑
     time_rate = min((hour * 60 + minute) / (22 * 60), 1)
-    min_step = int(config.get("MIN_STEP", 18000))
-    max_step = int(config.get("MAX_STEP", 25000))
+    if step_range is None:
+        step_range = (config.get("MIN_STEP", 18000), config.get("MAX_STEP", 25000))
+    min_step, max_step = int(step_range[0]), int(step_range[1])
     return int(time_rate * min_step), int(time_rate * max_step)
 
 # 虚拟ip地址
@@ -54,68 +98,62 @@ def desensitize_user_name(user):
     return f'{user[:3]}****{user[-4:]}'
 
 
-# 获取北京时间
-def get_beijing_time():
-    target_timezone = pytz.timezone('Asia/Shanghai')
-    # 获取当前时间
-    return datetime.now().astimezone(target_timezone)
-
+# 转换为登录使用的账号格式，手机号补全+86
+def to_login_user(user):
+    user = str(user)
+    if (user.startswith("+86")) or "@" in user:
+        return user
+    return "+86" + user
 
-# 格式化时间
-def format_now():
-    return get_beijing_time().strftime("%Y-%m-%d %H:%M:%S")
 
-
-# 获取时间戳
-def get_time():
-    current_time = get_beijing_time()
-    return "%.0f" % (current_time.timestamp() * 1000)
-
-
-# 获取登录code
-def get_access_token(location):
-    code_pattern = re.compile("(?<=access=).*?(?=&)")
-    result = code_pattern.findall(location)
-    if result is None or len(result) == 0:
+# 今天已经提交的步数，token信息中没有今天的提交记录时返回None
+def get_posted_step_today(user):
+    posted_info = posted_steps.get(user)
+    if posted_info is None or posted_info.get("date") != today:
         return None
-    return result[0]
-
-
-def get_error_code(location):
-    code_pattern = re.compile("(?<=error=).*?(?=&)")
-    result = code_pattern.findall(location)
-    if result is None or len(result) == 0:
-        return None
-    return result[0]
+    return posted_info.get("step")
 
 
 class MiMotionRunner:
-    def __init__(self, _user, _passwd):
+    def __init__(self, _user, _passwd, account_idx=None, deadline=None):
         self.user_id = None
+        # 账号的截止时间，传入每个接口请求，超过后请求直接失败
+        self.deadline = deadline
+        # 账号序号，仅用于耗时统计，不记录账号本身
+        self.account_idx = account_idx
+        # 最终获取到app_token所使用的token层级
+        self.token_tier = None
         self.device_id = str(uuid.uuid4())
         user = str(_user)
         password = str(_passwd)
         self.invalid = False
-        self.log_str = ""
+        # 今天已经提交过足够的步数，本次跳过提交
+        self.skipped = False
+        # 失败时的错误分类
+        self.error_class = None
+        self.log_lines = []
         if user == '' or password == '':
             self.error = "用户名或密码填写有误！"
             self.invalid = True
             pass
         self.password = password
-        if (user.startswith("+86")) or "@" in user:
-            user = user
-        else:
-            user = "+86" + user
+        user = to_login_user(user)
         if user.startswith("+86"):
             self.is_phone = True
         else:
             self.is_phone = False
         self.user = user
         # self.fake_ip_addr = fake_ip()
-        # self.log_str += f"创建虚拟ip地址：{self.fake_ip_addr}\n"
+        # self.log(f"创建虚拟ip地址：{self.fake_ip_addr}")
+
+    # 记录一行日志，超过上限后只保留前面的日志
+    def log(self, line):
+        if len(self.log_lines) < MAX_LOG_LINES:
+            self.log_lines.append(line.rstrip("\n"))
 
-    # 登录
-    def login(self):
+    # 登录 trust_fresh为True时签发不久的app_token直接使用，不再校验
+    def login(self, trust_fresh=True):
+        self.trusted_app_token = False
         user_token_info = user_tokens.get(self.user)
         if user_token_info is not None:
             access_token = user_token_info.get("access_token")
@@ -126,20 +164,57 @@ class MiMotionRunner:
             if self.device_id is None:
                 self.device_id = str(uuid.uuid4())
                 user_token_info["device_id"] = self.device_id
-            ok, msg = zeppHelper.check_app_token(app_token)
+                user_tokens.put(self.user, user_token_info)
+            app_token_time = user_token_info.get('app_token_time')
+            if trust_fresh and app_token is not None and token_lifecycle.is_fresh("app_token", app_token_time):
+                self.log(f"app_token签发不久 跳过校验直接使用 last grant time: {app_token_time}\n")
+                token_lifecycle.record_trusted("app_token")
+                self.trusted_app_token = True
+                self.token_tier = "app_token"
+                return app_token
+            try:
+                ok, msg = self.call_api("check_app_token", zeppHelper.MIFIT_CN3_HOST, "app_token",
+                                        zeppHelper.check_app_token, app_token)
+                if zeppHelper.is_token_verdict(ok, msg):
+                    token_lifecycle.observe("app_token", app_token_time, ok)
+            except IOError as e:
+                # 校验接口不可用时无法判断token是否有效，不计入token有效期统计，直接重新获取
+                ok, msg = False, f"校验异常：{e}"
             if ok:
-                self.log_str += "使用加密保存的app_token\n"
+                self.log("使用加密保存的app_token\n")
+                self.token_tier = "app_token"
                 return app_token
             else:
-                self.log_str += f"app_token失效 重新获取 last grant time: {user_token_info.get('app_token_time')}\n"
+                self.log(f"app_token失效 重新获取 last grant time: {app_token_time}\n")
+                # login_token 临近过期时提前续期
+                renewed = False
+                if token_lifecycle.needs_renew("login_token", user_token_info.get('login_token_time')):
+                    renewed = self.renew_login_token(user_token_info)
+                    if renewed:
+                        token_lifecycle.record_renewed("login_token")
+                login_token = user_token_info.get("login_token")
                 # 检查login_token是否可用
-                app_token, msg = zeppHelper.grant_app_token(login_token)
+                login_token_time = user_token_info.get('login_token_time')
+                app_token, msg = self.call_api("grant_app_token", zeppHelper.ACCOUNT_CN_HOST, "login_token",
+                                               zeppHelper.grant_app_token, login_token)
+                if zeppHelper.is_token_verdict(app_token, msg):
+                    token_lifecycle.observe("login_token", login_token_time, app_token is not None)
+                if app_token is None and not renewed and self.renew_login_token(user_token_info):
+                    # 续期成功则不需要退回到access_token登录
+                    app_token, msg = self.call_api("grant_app_token", zeppHelper.ACCOUNT_CN_HOST, "login_token",
+                                                   zeppHelper.grant_app_token, user_token_info.get("login_token"))
+                    if app_token is not None:
+                        token_lifecycle.record_renewed("login_token", saved_calls=1)
                 if app_token is None:
-                    self.log_str += f"login_token 失效 重新获取 last grant time: {user_token_info.get('login_token_time')}\n"
-                    login_token, app_token, user_id, msg = zeppHelper.grant_login_tokens(access_token, self.device_id,
-                                                                                         self.is_phone)
+                    self.log(f"login_token 失效 重新获取 last grant time: {login_token_time}\n")
+                    login_token, app_token, user_id, msg = self.call_api("grant_login_tokens", zeppHelper.ACCOUNT_HOST,
+                                                                         "access_token", zeppHelper.grant_login_tokens,
+                                                                         access_token, self.device_id, self.is_phone)
+                    if zeppHelper.is_token_verdict(login_token, msg):
+                        token_lifecycle.observe("access_token", user_token_info.get('access_token_time'),
+                                                login_token is not None)
                     if login_token is None:
-                        self.log_str += f"access_token 已失效：{msg} last grant time:{user_token_info.get('access_token_time')}\n"
+                        self.log(f"access_token 已失效：{msg} last grant time:{user_token_info.get('access_token_time')}\n")
                     else:
                         user_token_info["login_token"] = login_token
                         user_token_info["app_token"] = app_token
@@ -147,23 +222,29 @@ class MiMotionRunner:
                         user_token_info["login_token_time"] = get_time()
                         user_token_info["app_token_time"] = get_time()
                         self.user_id = user_id
+                        user_tokens.put(self.user, user_token_info)
+                        self.token_tier = "access_token"
                         return app_token
                 else:
-                    self.log_str += "重新获取app_token成功\n"
+                    self.log("重新获取app_token成功\n")
                     user_token_info["app_token"] = app_token
                     user_token_info["app_token_time"] = get_time()
+                    user_tokens.put(self.user, user_token_info)
+                    self.token_tier = "login_token"
                     return app_token
 
         # access_token 失效 或者没有保存加密数据
-        access_token, msg = zeppHelper.login_access_token(self.user, self.password)
+        access_token, msg = self.call_api("login_access_token", zeppHelper.LOGIN_HOST, "password",
+                                          zeppHelper.login_access_token, self.user, self.password)
         if access_token is None:
-            self.log_str += "登录获取accessToken失败：%s" % msg
+            self.log("登录获取accessToken失败：%s" % msg)
             return None
         # print(f"device_id:{self.device_id} isPhone: {self.is_phone}")
-        login_token, app_token, user_id, msg = zeppHelper.grant_login_tokens(access_token, self.device_id,
-                                                                             self.is_phone)
+        login_token, app_token, user_id, msg = self.call_api("grant_login_tokens", zeppHelper.ACCOUNT_HOST, "password",
+                                                             zeppHelper.grant_login_tokens,
+                                                             access_token, self.device_id, self.is_phone)
         if login_token is None:
-            self.log_str += f"登录提取的 access_token 无效：{msg}"
+            self.log(f"登录提取的 access_token 无效：{msg}")
             return None
 
         user_token_info = dict()
@@ -178,109 +259,518 @@ class MiMotionRunner:
         if self.device_id is None:
             self.device_id = uuid.uuid4()
         user_token_info["device_id"] = self.device_id
-        user_tokens[self.user] = user_token_info
+        user_tokens.put(self.user, user_token_info)
+        self.token_tier = "password"
         return app_token
 
+    def posted_step_today(self):
+        return get_posted_step_today(self.user)
+
+    # 记录今天提交的步数，加密保存，后续执行时判断是否需要再次提交
+    def record_posted_step(self, step):
+        posted_steps.put(self.user, {"date": today, "step": step, "time": format_now()})
+
     # 主函数
     def login_and_post_step(self, min_step, max_step):
         if self.invalid:
+            self.error_class = ERROR_INVALID_CONFIG
             return "账号或密码配置有误", False
+        if skip_posted:
+            # 今天已提交的步数不低于当前的最小步数时不需要登录和提交
+            posted_step = self.posted_step_today()
+            if posted_step is not None and posted_step >= min_step:
+                self.skipped = True
+                return f"今天已提交步数（{posted_step}）不低于当前最小步数（{min_step}），跳过提交", True
         app_token = self.login()
         if app_token is None:
+            self.error_class = ERROR_LOGIN
             return "登陆失败！", False
 
         step = str(random.randint(min_step, max_step))
-        self.log_str += f"已设置为随机步数范围({min_step}~{max_step}) 随机值:{step}\n"
-        ok, msg = zeppHelper.post_fake_brand_data(step, app_token, self.user_id)
+        self.log(f"已设置为随机步数范围({min_step}~{max_step}) 随机值:{step}\n")
+        ok, msg = self.call_api("band_data", zeppHelper.MIFIT_CN_HOST, self.token_tier,
+                                zeppHelper.post_fake_brand_data, step, app_token, self.user_id)
+        if not ok and self.trusted_app_token:
+            # 未经校验的app_token提交失败，校验后重新获取token再提交一次
+            self.log(f"未校验的app_token提交失败：{msg} 校验后重试\n")
+            retry_app_token = self.login(trust_fresh=False)
+            if retry_app_token is not None and retry_app_token != app_token:
+                ok, msg = self.call_api("band_data", zeppHelper.MIFIT_CN_HOST, self.token_tier,
+                                        zeppHelper.post_fake_brand_data, step, retry_app_token, self.user_id)
+        if ok:
+            self.record_posted_step(int(step))
+        else:
+            self.error_class = ERROR_POST
         return f"修改步数（{step}）[" + msg + "]", ok
 
+    # 调用华米接口并记录耗时，接口函数返回值的第一个元素表示是否成功
+    def call_api(self, stage, host, tier, func, *args):
+        with run_metrics.span(stage, host, tier, self.account_idx) as span:
+            try:
+                result = func(*args, deadline=self.deadline)
+            except zeppHelper.CircuitOpenError:
+                span.status = "circuit_open"
+                raise
+            except zeppHelper.DeadlineExceeded:
+                span.status = "deadline"
+                raise
+            if not result[0]:
+                span.status = "fail"
+            return result
+
+    # 续期login_token，成功时更新保存的token信息
+    def renew_login_token(self, user_token_info) -> bool:
+        if not user_token_info.get("login_token"):
+            return False
+        try:
+            login_token, msg = self.call_api("renew_login_token", zeppHelper.ACCOUNT_CN3_HOST, "login_token",
+                                             zeppHelper.renew_login_token, user_token_info.get("login_token"))
+        except Exception as e:
+            login_token, msg = None, f"续期异常：{e}"
+        if login_token is None:
+            self.log(f"login_token 续期失败：{msg}\n")
+            return False
+        self.log("login_token 续期成功\n")
+        user_token_info["login_token"] = login_token
+        user_token_info["login_token_time"] = get_time()
+        user_tokens.put(self.user, user_token_info)
+        return True
+
 
-def run_single_account(total, idx, user_mi, passwd_mi):
+def run_single_account(total, idx, user_mi, passwd_mi, step_range=None):
     idx_info = ""
     if idx is not None:
-        idx_info = f"[{idx + 1}/{total}]"
-    log_str = f"[{format_now()}]\n{idx_info}账号：{desensitize_user_name(user_mi)}\n"
+        # 从文件读取账号时，执行结束前不知道账号总数
+        idx_info = f"[{idx + 1}/{total}]" if total is not None else f"[{idx + 1}]"
+    runner = None
     try:
-        runner = MiMotionRunner(user_mi, passwd_mi)
-        exec_msg, success = runner.login_and_post_step(min_step, max_step)
-        log_str += runner.log_str
-        log_str += f'{exec_msg}\n'
-        exec_result = {"user": user_mi, "success": success,
-                       "msg": exec_msg}
-    except:
-        log_str += f"执行异常:{traceback.format_exc()}\n"
-        log_str += traceback.format_exc()
-        exec_result = {"user": user_mi, "success": False,
-                       "msg": f"执行异常:{traceback.format_exc()}"}
-    print(log_str)
+        runner = MiMotionRunner(user_mi, passwd_mi, idx,
+                                None if run_deadline is None else run_deadline.child(account_timeout))
+        if step_range is None:
+            exec_msg, success = runner.login_and_post_step(min_step, max_step)
+        else:
+            exec_msg, success = runner.login_and_post_step(*get_min_max_by_time(step_range=step_range))
+        log_lines = runner.log_lines + [exec_msg]
+        exec_result = AccountResult(user_mi, success, exec_msg, None if success else runner.error_class,
+                                    runner.skipped)
+    except Exception as e:
+        # 堆栈只输出到日志中，执行结果只保存错误分类和异常说明
+        log_lines = (runner.log_lines if runner is not None else []) + [traceback.format_exc().rstrip("\n")]
+        exec_result = AccountResult(user_mi, False, f"执行异常:{type(e).__name__}: {e}", classify_exception(e))
+    run_logger.account(idx_info, desensitize_user_name(user_mi), log_lines, exec_result)
+    run_journal.record(to_login_user(user_mi), exec_result.to_dict())
     return exec_result
 
 
+# 执行账号时在记录日志等环节出现未捕获的异常，记为该账号执行失败，不影响其他账号
+def account_exception(e, total, idx, user_mi, passwd_mi, step_range=None):
+    print(f"账号{desensitize_user_name(user_mi)}执行异常：{type(e).__name__}: {e}")
+    return AccountResult(user_mi, False, f"执行异常:{type(e).__name__}: {e}", classify_exception(e))
+
+
+# 预测单个账号的执行耗时，今天已提交过足够步数的账号不会请求接口
+def estimate_account_cost(user, step_range) -> float:
+    token_info = user_tokens.get(to_login_user(user))
+    posted_step = get_posted_step_today(to_login_user(user))
+    if skip_posted and posted_step is not None:
+        current_min_step = min_step if step_range is None else get_min_max_by_time(step_range=step_range)[0]
+        if posted_step >= current_min_step:
+            return 0.0
+    return cost_planner.estimate(account_stages(token_info, token_lifecycle))
+
+
+# 自适应并发模式下，拿到执行名额后再执行单个账号
+def run_single_account_adaptive(total, idx, user_mi, passwd_mi, step_range=None):
+    with adaptive_limiter.slot():
+        return run_single_account(total, idx, user_mi, passwd_mi, step_range)
+
+
+# 账号是否属于当前分片
+def in_current_shard(user):
+    return shard is None or sharding.shard_of(to_login_user(user), shard[1]) == shard[0]
+
+
 def execute():
-    user_list = users.split('#')
-    passwd_list = passwords.split('#')
+    global run_deadline
+    total = account_source.total
+    # 账号执行的截止时间，预留保存token和推送的时间，守护模式下每次执行重新计时
+    run_deadline = None if run_timeout is None else Deadline(max(run_timeout - DEADLINE_RESERVE, 0))
+    if shard is not None:
+        print(f"当前分片：{shard[0]}/{shard[1]}")
+    # 本次执行的账号，用于清理token文件以及记录分片结果，账号本身按需从来源中逐个读取
+    active_users = []
+    account_indexes = []
+    # 续跑时今天已经执行成功的账号，直接使用执行日志中的结果
+    resumed_results = []
+    # 超过执行时限未开始执行的账号
+    deadline_results = []
+
+    def account_tasks():
+        for account in account_source:
+            if not in_current_shard(account.user):
+                continue
+            active_users.append(to_login_user(account.user))
+            if cli_args.resume:
+                previous_result = run_journal.completed_result(to_login_user(account.user))
+                if previous_result is not None:
+                    resumed_results.append((account.index, AccountResult.from_dict(previous_result)))
+                    continue
+            yield total, account.index, account.user, account.password, account.step_range
+
+    def started_tasks(tasks):
+        for task in tasks:
+            if stop_event.is_set():
+                # 收到终止信号后不再开始新的账号
+                return
+            if run_deadline is not None and run_deadline.remaining() < http_timeout:
+                # 剩余时间不足以完成一次请求，不再开始新的账号，剩余账号继续读取用于清理token文件和推送报告
+                deadline_results.append((task[1], AccountResult(task[2], False, "超过执行时限，未执行", ERROR_DEADLINE)))
+                continue
+            # 结果按开始执行的顺序返回，记录对应的账号序号
+            account_indexes.append(task[1])
+            yield task
+
+    tasks = account_tasks()
+    if cost_planner is not None:
+        # 在预读窗口内按预测耗时从长到短执行，只提前读取和解密一个窗口的账号
+        tasks = cost_planner.plan(((estimate_account_cost(task[2], task[4]), task) for task in tasks), max_workers)
+    profile_mark("prepare")
+    worker = run_single_account if adaptive_limiter is None else run_single_account_adaptive
     exec_results = []
-    if len(user_list) == len(passwd_list):
-        idx, total = 0, len(user_list)
-        if use_concurrent:
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                exec_results = executor.map(lambda x: run_single_account(total, x[0], *x[1]),
-                                            enumerate(zip(user_list, passwd_list)))
-        else:
-            for user_mi, passwd_mi in zip(user_list, passwd_list):
-                exec_results.append(run_single_account(total, idx, user_mi, passwd_mi))
-                idx += 1
-                if idx < total:
-                    # 每个账号之间间隔一定时间请求一次，避免接口请求过于频繁导致异常
-                    time.sleep(sleep_seconds)
-        if encrypt_support:
-            persist_user_tokens()
-        success_count = 0
-        push_results = []
-        for result in exec_results:
-            push_results.append(result)
-            if result['success'] is True:
-                success_count += 1
-        summary = f"\n执行账号总数{total}，成功：{success_count}，失败：{total - success_count}"
-        print(summary)
-        push_util.push_results(push_results, summary, push_config)
+    started = time.perf_counter()
+    if use_concurrent:
+        from util import account_runner
+        exec_results = account_runner.run_threaded(started_tasks(tasks), worker, max_workers, account_exception)
     else:
-        print(f"账号数长度[{len(user_list)}]和密码数长度[{len(passwd_list)}]不匹配，跳过执行")
+        requested = False
+        for task in started_tasks(tasks):
+            # 请求过接口的账号之后间隔一定时间，避免接口请求过于频繁导致异常，收到终止信号时立即结束等待
+            # 今天已提交跳过以及配置有误的账号没有请求接口，不需要等待
+            if requested and stop_event.wait(sleep_seconds):
+                break
+            result = run_single_account(*task)
+            exec_results.append(result)
+            requested = not result.skipped and result.error != ERROR_INVALID_CONFIG
+    elapsed = time.perf_counter() - started
+    # 等待所有账号的日志写出后再输出汇总信息
+    run_logger.flush()
+    profile_mark("accounts")
+    total = account_source.total
+    interrupted = stop_event.is_set()
+    # 续跑时合并执行日志中已成功的结果，按账号顺序推送一份完整的报告
+    indexed_results = sorted(resumed_results + deadline_results + list(zip(account_indexes, exec_results)),
+                             key=lambda item: item[0])
+    success_count = sum(1 for _, result in indexed_results if result.success)
+    error_counts = dict()
+    for _, result in indexed_results:
+        if result.error is not None:
+            error_counts[result.error] = error_counts.get(result.error, 0) + 1
+    # 包括未开始执行的账号以及执行中超过时限的账号
+    deadline_count = error_counts.get(ERROR_DEADLINE, 0)
+    summary = None
+    if not interrupted and shard is None:
+        summary = f"\n执行账号总数{total}，成功：{success_count}，失败：{total - success_count}"
+        skipped_count = sum(1 for _, result in indexed_results if result.skipped)
+        if skipped_count:
+            summary += f"，其中今天已提交跳过：{skipped_count}"
+        if deadline_count:
+            summary += f"，超过执行时限未完成：{deadline_count}"
+        # 账号执行完成后立即将报告放入推送队列，由后台线程推送，和保存token等收尾工作同时进行
+        push_report([result for _, result in indexed_results], summary)
+    if cost_planner is not None:
+        planned_count, predicted, original = cost_planner.prediction(max_workers)
+        print(f"按预测耗时分窗口排序执行{planned_count}个账号，预计耗时{predicted:.1f}秒，"
+              f"按原顺序预计{original:.1f}秒，实际耗时{elapsed:.1f}秒")
+        cost_planner.update(run_metrics.stage_summary())
+    if encrypt_support:
+        # 被中断时还有账号没有读取到，不能按本次执行的账号清理token文件
+        persist_user_tokens(None if interrupted else active_users)
+        if shard is None:
+            token_lifecycle.save()
+            if cost_planner is not None and not cost_planner.save():
+                print("各阶段耗时和历史数据相差不大，不更新历史耗时文件")
+    profile_mark("persist")
+    print(token_lifecycle.summary())
+    print(run_metrics.format_summary())
+    print(zeppHelper.format_host_health())
+    if adaptive_limiter is not None:
+        print(adaptive_limiter.summary())
+    print(f"RUN_METRICS_JSON {json.dumps(run_metrics.to_dict(include_spans=False), ensure_ascii=False)}")
+    if timing_output:
+        run_metrics.dump(timing_output)
+        print(f"已导出耗时明细：{timing_output}")
+    if run_history is not None:
+        record_run_history(list(zip(account_indexes, exec_results)), interrupted)
+    if error_counts:
+        print("失败分类：" + " ".join(f"{error}:{count}" for error, count in error_counts.items()))
+    if resumed_results:
+        print(f"\n续跑跳过今天已成功的账号{len(resumed_results)}个")
+    if deadline_count:
+        print(f"\n超过执行时限未完成的账号{deadline_count}个，"
+              f"其中未开始执行{len(deadline_results)}个，使用 --resume 继续执行剩余账号")
+    if interrupted:
+        # 未执行的账号留给 --resume，被中断时不推送也不保存分片结果
+        print(f"\n执行被中断，已完成账号数{len(indexed_results)}，成功：{success_count}，"
+              f"失败：{len(indexed_results) - success_count}，使用 --resume 继续执行剩余账号")
         exit(1)
-
-
-def prepare_user_tokens() -> dict:
-    data_path = r"encrypted_tokens.data"
-    if os.path.exists(data_path):
-        with open(data_path, 'rb') as f:
-            data = f.read()
+    # 全部账号执行完成后不再需要续跑，删除执行日志，避免每次执行都产生新的文件内容
+    # 超过执行时限时保留执行日志，剩余账号可以使用 --resume 继续执行
+    if not deadline_count:
+        run_journal.finish()
+    if shard is not None:
+        # 分片只保存执行结果，由 --merge 合并后统一推送
+        result_path = sharding.write_shard_result(shard[0], shard[1], total,
+                                                  [(idx, result.to_dict()) for idx, result in indexed_results],
+                                                  aes_key, {"lifecycle": token_lifecycle.delta()})
+        print(f"\n分片{shard[0]}/{shard[1]}执行账号数{len(indexed_results)}，成功：{success_count}，"
+              f"失败：{len(indexed_results) - success_count}，结果已保存：{result_path}")
+        return
+    print(summary)
+
+
+# 渲染报告并放入推送队列，后台推送本次以及之前推送失败的报告，不等待推送结果
+def push_report(exec_results, summary):
+    if not push_util.not_in_push_time_range(push_config):
+        report = push_util.render_report(exec_results, summary, push_config.push_plus_max)
+        push_outbox.enqueue(current_run_id(), report, push_util.configured_channels(push_config))
+    if push_outbox.has_pending():
+        push_outbox.deliver_async(push_config)
+
+
+# 本次执行的ID，用于推送去重。Actions中重新运行时 GITHUB_RUN_ID 不变，同一次执行的报告只推送一次
+def current_run_id():
+    run_id = os.environ.get("GITHUB_RUN_ID")
+    if run_id and not cli_args.daemon:
+        return run_id
+    return time_bj.strftime("%Y%m%d%H%M%S")
+
+
+# 性能分析模式下记录阶段结束时的内存快照
+def profile_mark(stage):
+    if profiler is not None:
+        profiler.mark(stage)
+
+
+# 性能分析模式下执行，结束后输出采样的折叠栈和各阶段内存报告
+# 采样在读取token文件之前已经开始，各阶段依次为：读取配置和token文件、解密、准备、执行账号、保存、推送
+def execute_with_profiler():
+    profile_mark("load")
+    try:
+        # 正常执行时token在执行账号时按需解密，性能分析模式下提前解密所有记录，单独统计解密阶段
+        user_tokens.values()
+        posted_steps.values()
+        profile_mark("decrypt")
+        execute()
+        push_outbox.wait()
+        profile_mark("push")
+    finally:
+        stacks_path, memory_path = profiler.stop()
+        print(profiler.format_hotspots())
+        print(profiler.format_memory_report())
+        print(f"已导出折叠栈：{stacks_path}（可使用 flamegraph.pl 或 https://www.speedscope.app 查看），内存报告：{memory_path}")
+
+
+# 守护模式：常驻进程按执行时间定时执行，token、连接池和配置只在启动时加载一次
+def run_daemon():
+    global time_bj, today, min_step, max_step, run_metrics, run_journal
+    from util import scheduler
+    try:
+        if config.get('DAEMON_SCHEDULE'):
+            schedule = scheduler.parse_schedule(config.get('DAEMON_SCHEDULE'))
+        elif json.loads(config.get("HOUR_STEP_RANGES", "[]")):
+            schedule = scheduler.schedule_from_hour_ranges(json.loads(config.get("HOUR_STEP_RANGES")))
+        else:
+            schedule = list(scheduler.DEFAULT_SCHEDULE)
+    except ValueError as e:
+        print(e)
+        exit(1)
+    print("守护模式：每天北京时间 " + ",".join(f"{hour:02d}:{minute:02d}" for hour, minute in schedule) + " 执行")
+    while True:
+        next_time = scheduler.next_run_time(schedule, get_beijing_time())
+        print(f"下次执行时间：{next_time.strftime('%Y-%m-%d %H:%M')}", flush=True)
+        if stop_event.wait((next_time - get_beijing_time()).total_seconds()):
+            print("收到终止信号，守护模式退出")
+            return
+        # 每次执行重新计算时间和步数范围，其余状态保留在内存中
+        time_bj = get_beijing_time()
+        today = time_bj.strftime("%Y-%m-%d")
+        min_step, max_step = get_min_max_by_time()
+        run_metrics = RunMetrics()
+        token_lifecycle.reset_stats()
+        user_tokens.clear_changed()
+        posted_steps.clear_changed()
+        run_journal = prepare_run_journal()
         try:
-            decrypted_data = decrypt_data(data, aes_key, None)
-            # 假设原始明文为 UTF-8 编码文本
-            return json.loads(decrypted_data.decode('utf-8', errors='strict'))
-        except:
-            print("密钥不正确或者加密内容损坏 放弃token")
-            return dict()
-    else:
-        return dict()
+            execute()
+        except Exception:
+            # 单次执行失败不影响后续的定时执行
+            traceback.print_exc()
 
 
-def persist_user_tokens():
-    data_path = r"encrypted_tokens.data"
-    origin_str = json.dumps(user_tokens, ensure_ascii=False)
-    cipher_data = encrypt_data(origin_str.encode("utf-8"), aes_key, None)
-    with open(data_path, 'wb') as f:
-        f.write(cipher_data)
-        f.flush()
-        f.close()
+# 保存本次执行的记录到历史数据库，续跑时跳过的账号不计入
+def record_run_history(indexed_results, interrupted):
+    account_metrics = run_metrics.account_summary()
+    accounts = []
+    for idx, result in indexed_results:
+        metrics = account_metrics.get(idx, {})
+        accounts.append({"user": to_login_user(result.user), "label": desensitize_user_name(result.user),
+                         "success": result.success, "skipped": result.skipped,
+                         "tier": metrics.get("tier"), "calls": metrics.get("calls", 0),
+                         "elapsed_ms": metrics.get("elapsed_ms", 0)})
+    mode = "thread" if use_concurrent else "serial"
+    if adaptive_limiter is not None:
+        mode += "+adaptive"
+    run = {"started": run_metrics.started, "duration_ms": (time.time() - run_metrics.started) * 1000,
+           "mode": mode, "concurrency": max_workers, "interrupted": interrupted,
+           "shard": f"{shard[0]}/{shard[1]}" if shard is not None else None}
+    try:
+        run_id = run_history.record_run(run, accounts, run_metrics.stage_summary())
+        print(f"已保存执行记录#{run_id}到{run_history.path}")
+    except Exception as e:
+        print(f"保存执行记录失败：{e}")
+
+
+def prepare_run_journal() -> RunJournal:
+    # 未配置AES_KEY时执行日志只保存在内存中，避免明文账号被提交到仓库
+    if not encrypt_support:
+        if cli_args.resume:
+            print("AES_KEY未设置或者无效 无法使用续跑功能，将执行全部账号")
+        return RunJournal(None, None, today)
+    # 分片各自使用单独的执行日志
+    path = RUN_JOURNAL_PATH if shard is None else sharding.segment_path(RUN_JOURNAL_PATH, *shard)
+    journal = RunJournal(path, aes_key, today).start(cli_args.resume)
+    if cli_args.resume:
+        print(f"续跑模式：执行日志中已有{len(journal)}个账号的记录")
+    return journal
+
+
+# 收到终止信号时不再开始新的账号，正在执行的账号结束后保存token和执行日志
+def handle_stop_signal(signum, frame):
+    print(f"收到终止信号{signum}，等待正在执行的账号结束，再次发送将直接退出")
+    stop_event.set()
+    signal.signal(signum, signal.SIG_DFL)
+
+
+def prepare_store(path, header=STORE_HEADER) -> TokenStore:
+    # 只读取每个账号的密文，用到时才解密
+    if shard is None:
+        return TokenStore(path, aes_key, header).load()
+    # 分片使用单独的文件，避免多个进程同时写同一个文件
+    return TokenStore(sharding.segment_path(path, *shard), aes_key, header).load()
+
+
+def seed_shard_tokens():
+    # 分片文件中没有的账号从主文件复制，主文件由 --merge 合并各分片后更新
+    shard_users = [to_login_user(user) for user in account_source.iter_users() if in_current_shard(user)]
+    for store, path, header in ((user_tokens, TOKEN_DATA_PATH, STORE_HEADER),
+                                (posted_steps, POSTED_STEP_PATH, POSTED_STEP_HEADER)):
+        copied = store.absorb(TokenStore(path, aes_key, header).load(), shard_users)
+        if copied:
+            print(f"已从{path}复制{copied}个账号的记录到分片文件")
+
+
+def persist_user_tokens(active_users):
+    # token在每个账号登录成功且内容有变化时已经追加写入，这里只压缩旧记录并清理不在本次执行范围内的账号
+    # active_users 为 None 时只压缩旧记录
+    changed_users = user_tokens.changed_users()
+    if changed_users:
+        print(f"token有变化的账号{len(changed_users)}个：{','.join(desensitize_user_name(user) for user in changed_users[:20])}"
+              + ("等" if len(changed_users) > 20 else ""))
+    else:
+        print("没有账号的token发生变化")
+    if user_tokens.compact(active_users):
+        print("已压缩token存储文件")
+    # 提交步数只写入单独的文件，不计入token变化
+    posted_users = posted_steps.changed_users()
+    if posted_users:
+        print(f"记录今天提交步数的账号{len(posted_users)}个")
+    posted_steps.compact(active_users)
+
+
+# 合并各分片的执行结果、token文件以及token生命周期观测，统一推送一次
+def merge_shards():
+    import shutil
+    exec_results, shards, missing = sharding.load_shard_results(aes_key)
+    exec_results = [AccountResult.from_dict(result) for result in exec_results]
+    if not shards:
+        print(f"{sharding.SHARD_RESULT_DIR} 中没有分片执行结果，无法合并")
+        exit(1)
+    if encrypt_support:
+        segments = sharding.list_segments(TOKEN_DATA_PATH)
+        active_users = [to_login_user(user) for user in account_source.iter_users()]
+        for store, path, header in ((user_tokens, TOKEN_DATA_PATH, STORE_HEADER),
+                                    (posted_steps, POSTED_STEP_PATH, POSTED_STEP_HEADER)):
+            for segment in sharding.list_segments(path):
+                store.absorb(TokenStore(segment, aes_key, header).load())
+                os.remove(segment)
+            store.compact(active_users)
+        for shard_data in shards:
+            token_lifecycle.merge_delta(shard_data.get("lifecycle", {}))
+        token_lifecycle.save()
+        print(f"已合并{len(segments)}个分片token文件到{TOKEN_DATA_PATH}")
+    success_count = sum(1 for result in exec_results if result.success)
+    total = len(exec_results)
+    summary = f"\n执行账号总数{total}，成功：{success_count}，失败：{total - success_count}"
+    if missing:
+        summary += f"\n缺少分片：{','.join(str(x) for x in missing)}/{shards[0]['count']}，对应账号未执行"
+    print(summary)
+    push_report(exec_results, summary)
+    shutil.rmtree(sharding.SHARD_RESULT_DIR, ignore_errors=True)
+    push_outbox.wait()
+
+
+# 在本机启动多个进程分片执行，全部结束后合并结果
+def run_local_shards(count):
+    import shutil
+    import subprocess
+    shutil.rmtree(sharding.SHARD_RESULT_DIR, ignore_errors=True)
+    extra_args = ["--resume"] if cli_args.resume else []
+    processes = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "--shard", f"{i}/{count}"] + extra_args)
+                 for i in range(1, count + 1)]
+    for process in processes:
+        process.wait()
+    merge_shards()
+
+
+def parse_cli_args():
+    parser = argparse.ArgumentParser(description="mimotion 刷步数")
+    parser.add_argument("--shard", help="只执行第i个分片的账号，格式 i/n，结果由 --merge 合并推送")
+    parser.add_argument("--merge", action="store_true", help="合并各分片的执行结果和token文件并推送")
+    parser.add_argument("--local-shards", type=int, default=0, help="在本机启动n个进程分片执行并自动合并")
+    parser.add_argument("--resume", action="store_true", help="续跑被中断的执行，跳过今天已成功的账号并推送完整报告")
+    parser.add_argument("--daemon", action="store_true",
+                        help="守护模式，常驻进程按 DAEMON_SCHEDULE 定时执行，适用于自建服务器")
+    parser.add_argument("--profile", nargs="?", const="profile", metavar="DIR",
+                        help="采样分析整个执行过程的CPU和内存，结果输出到DIR目录，默认为profile")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    cli_args = parse_cli_args()
+    shard = None
+    profiler = None
+    run_deadline = None
+    if cli_args.shard:
+        try:
+            shard = sharding.parse_shard(cli_args.shard)
+        except ValueError as e:
+            print(e)
+            exit(1)
+    if cli_args.daemon and (shard is not None or cli_args.merge or cli_args.local_shards > 1):
+        print("守护模式不支持分片执行")
+        exit(1)
+    if cli_args.profile and not (cli_args.daemon or cli_args.merge or cli_args.local_shards > 1):
+        # 在读取token文件之前开始采样，覆盖读取和解密token的耗时
+        from util.profiler import RunProfiler
+        profiler = RunProfiler(cli_args.profile).start()
     # 北京时间
     time_bj = get_beijing_time()
+    today = time_bj.strftime("%Y-%m-%d")
     encrypt_support = False
-    user_tokens = dict()
+    user_tokens = TokenStore(None, None)
+    posted_steps = TokenStore(None, None, POSTED_STEP_HEADER)
+    token_lifecycle = TokenLifecycle()
+    run_metrics = RunMetrics()
     if os.environ.__contains__("AES_KEY") is True:
         aes_key = os.environ.get("AES_KEY")
         if aes_key is not None:
@@ -288,9 +778,15 @@ if __name__ == "__main__":
             if len(aes_key) == 16:
                 encrypt_support = True
         if encrypt_support:
-            user_tokens = prepare_user_tokens()
+            user_tokens = prepare_store(TOKEN_DATA_PATH)
+            posted_steps = prepare_store(POSTED_STEP_PATH, POSTED_STEP_HEADER)
+            token_lifecycle = TokenLifecycle(r"token_lifecycle.json").load()
         else:
             print("AES_KEY未设置或者无效 无法使用加密保存功能")
+    if not encrypt_support and (shard is not None or cli_args.merge or cli_args.local_shards > 1):
+        # 分片的执行结果包含账号，需要加密后才能作为artifact上传
+        print("分片执行需要配置AES_KEY，用于加密保存分片的执行结果和token")
+        exit(1)
     if os.environ.__contains__("CONFIG") is False:
         print("未配置CONFIG变量，无法执行")
         exit(1)
@@ -304,29 +800,106 @@ if __name__ == "__main__":
             traceback.print_exc()
             exit(1)
         # 创建推送配置对象
-        push_config = push_util.PushConfig(
-            push_plus_token=config.get('PUSH_PLUS_TOKEN'),
-            push_plus_hour=config.get('PUSH_PLUS_HOUR'),
-            push_plus_max=get_int_value_default(config, 'PUSH_PLUS_MAX', 30),
-            push_wechat_webhook_key=config.get('PUSH_WECHAT_WEBHOOK_KEY'),
-            telegram_bot_token=config.get('TELEGRAM_BOT_TOKEN'),
-            telegram_chat_id=config.get('TELEGRAM_CHAT_ID')
-        )
+        push_config = build_push_config(config)
+        # 未配置AES_KEY时推送队列只保存在内存中，推送失败的报告不会保留到下次执行
+        push_outbox = PushOutbox(PUSH_OUTBOX_PATH if encrypt_support else None,
+                                 aes_key if encrypt_support else None).load()
         sleep_seconds = config.get('SLEEP_GAP')
         if sleep_seconds is None or sleep_seconds == '':
             sleep_seconds = 5
         sleep_seconds = float(sleep_seconds)
-        users = config.get('USER')
-        passwords = config.get('PWD')
-        if users is None or passwords is None:
-            print("未正确配置账号密码，无法执行")
+        # 账号来源，配置了 ACCOUNT_FILE 时从文件中逐条读取
+        try:
+            account_source = open_account_source(config, aes_key if encrypt_support else None)
+        except ValueError as e:
+            print(e)
             exit(1)
         min_step, max_step = get_min_max_by_time()
+        # 今天已提交的步数不低于当前最小步数时跳过该账号，设置为False时每次都重新提交
+        skip_posted = config.get('SKIP_POSTED_STEP') != 'False'
         use_concurrent = config.get('USE_CONCURRENT')
+        if config.get('USE_ASYNC') == 'True':
+            # 账号执行是阻塞的requests调用，asyncio调度和多线程执行的效果相同，旧配置按多线程执行
+            print("USE_ASYNC 已合并到 USE_CONCURRENT，按多线程执行")
+            use_concurrent = 'True'
+        # 自适应并发：按接口延迟和错误自动调整并发，SLEEP_GAP 只作为持续过载时的最大账号间隔
+        use_adaptive = config.get('ADAPTIVE_CONCURRENCY') == 'True'
         if use_concurrent is not None and use_concurrent == 'True':
             use_concurrent = True
+        elif use_adaptive:
+            use_concurrent = True
         else:
             print(f"多账号执行间隔：{sleep_seconds}")
             use_concurrent = False
+        # 全局并发上限，未配置时和默认线程池大小保持一致
+        max_workers = config.get('MAX_CONCURRENCY')
+        if max_workers is None or max_workers == '':
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        max_workers = max(int(max_workers), 1)
+        if not use_concurrent:
+            max_workers = 1
+        # 单host并发上限，未配置时不做额外限制
+        host_limit = config.get('HOST_CONCURRENCY')
+        host_limit = int(host_limit) if host_limit is not None and host_limit != '' else None
+        # 连接池大小和并发数保持一致，串行执行时只需要一个连接
+        http_timeout = config.get('HTTP_TIMEOUT')
+        if http_timeout is None or http_timeout == '':
+            http_timeout = 10
+        # 临时性错误(5xx/429/网络异常)的重试次数
+        http_retries = config.get('HTTP_RETRIES')
+        http_retries = int(http_retries) if http_retries is not None and http_retries != '' else None
+        http_timeout = float(http_timeout)
+        zeppHelper.configure_http_client(max_workers, http_timeout, host_limit, http_retries)
+        # 整次执行的时限(分钟)，需要小于 workflow 的 timeout-minutes，超过后不再开始新的账号，设置为0时不限制
+        run_timeout = config.get('RUN_TIMEOUT')
+        run_timeout = float(run_timeout) if run_timeout is not None and run_timeout != '' else 50
+        run_timeout = run_timeout * 60 if run_timeout > 0 else None
+        # 单个账号的时限(秒)，未配置时为请求超时时间的6倍，不会超过整次执行的剩余时间
+        account_timeout = config.get('ACCOUNT_TIMEOUT')
+        account_timeout = float(account_timeout) if account_timeout is not None and account_timeout != '' \
+            else http_timeout * 6
+        adaptive_limiter = None
+        if use_adaptive:
+            from util.adaptive_concurrency import AdaptiveLimiter
+            adaptive_limiter = AdaptiveLimiter(max_workers, sleep_seconds)
+            zeppHelper.add_response_observer(adaptive_limiter.observe)
+        # 耗时明细导出路径，未配置时只打印各阶段汇总
+        timing_output = config.get('TIMING_OUTPUT')
+        # 执行记录数据库路径，未配置时不保存历史记录
+        run_history = None
+        if config.get('RUN_HISTORY_DB') and not encrypt_support:
+            print("未配置AES_KEY，无法对账号做HMAC，不保存执行记录")
+        elif config.get('RUN_HISTORY_DB'):
+            if os.environ.get("GITHUB_ACTIONS") == "true" and not cli_args.daemon:
+                print("执行记录数据库不会提交到仓库，Github Actions中每次执行结束后即被丢弃，趋势报告只适用于本地或守护模式执行")
+            from util.run_history import RunHistory
+            run_history = RunHistory(config.get('RUN_HISTORY_DB'), aes_key)
+        # 并发执行时按预测耗时从长到短安排账号，串行执行时顺序不影响总耗时
+        cost_planner = None
+        if use_concurrent and config.get('COST_SCHEDULING') != 'False':
+            cost_planner = CostPlanner(STAGE_LATENCY_PATH if encrypt_support else None).load()
         # endregion
-        execute()
+        if encrypt_support and shard is not None:
+            seed_shard_tokens()
+        if cli_args.merge:
+            merge_shards()
+        elif cli_args.local_shards > 1:
+            run_local_shards(cli_args.local_shards)
+        else:
+            run_journal = prepare_run_journal()
+            # 每个账号的日志由单独的线程整块输出，配置了 RUN_LOG_FILE 时同时写入JSON Lines文件
+            run_logger = RunLogger(config.get('RUN_LOG_FILE') or None).start()
+            stop_event = threading.Event()
+            signal.signal(signal.SIGTERM, handle_stop_signal)
+            signal.signal(signal.SIGINT, handle_stop_signal)
+            try:
+                if cli_args.daemon:
+                    run_daemon()
+                elif profiler is not None:
+                    execute_with_profiler()
+                else:
+                    execute()
+            finally:
+                # 等待后台推送结束并保存推送队列，推送超时时间由 PUSH_TIMEOUT 控制
+                push_outbox.wait()
+                run_logger.close()
@@ -0,0 +1,58 @@
+# -*- coding: utf8 -*-
+from util.deadline import DeadlineExceeded
+from util.http_client import CircuitOpenError
+
+# 执行结果中的错误分类，只保存分类和简短说明，不保存完整的异常堆栈
+ERROR_INVALID_CONFIG = "invalid_config"
+ERROR_LOGIN = "login_failed"
+ERROR_POST = "post_failed"
+ERROR_CIRCUIT_OPEN = "circuit_open"
+ERROR_NETWORK = "network"
+ERROR_DEADLINE = "deadline"
+ERROR_EXCEPTION = "exception"
+
+# 结果说明的最大长度，接口返回的异常内容可能很长
+MAX_MSG_LENGTH = 200
+
+
+def classify_exception(e) -> str:
+    """根据异常类型得到错误分类"""
+    if isinstance(e, CircuitOpenError):
+        return ERROR_CIRCUIT_OPEN
+    if isinstance(e, DeadlineExceeded):
+        return ERROR_DEADLINE
+    # requests 的异常均继承自 IOError
+    if isinstance(e, IOError):
+        return ERROR_NETWORK
+    return ERROR_EXCEPTION
+
+
+class AccountResult:
+    """
+    单个账号的执行结果
+      - 字段固定，使用 __slots__ 减少大量账号时的内存占用
+      - 失败时 error 为错误分类，msg 为截断后的简短说明
+      - 保存到分片结果和执行日志时转换为字典，只保留有值的字段
+    """
+    __slots__ = ("user", "success", "msg", "error", "skipped")
+
+    def __init__(self, user, success: bool, msg, error=None, skipped=False):
+        self.user = user
+        self.success = success
+        msg = str(msg)
+        self.msg = msg if len(msg) <= MAX_MSG_LENGTH else msg[:MAX_MSG_LENGTH] + "..."
+        self.error = error
+        self.skipped = skipped
+
+    def to_dict(self) -> dict:
+        data = {"user": self.user, "success": self.success, "msg": self.msg}
+        if self.error is not None:
+            data["error"] = self.error
+        if self.skipped:
+            data["skipped"] = True
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["user"], data.get("success") is True, data.get("msg", ""),
+                   data.get("error"), data.get("skipped", False))
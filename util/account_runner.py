@@ -0,0 +1,67 @@
+# -*- coding: utf8 -*-
+import threading
+
+
+def _call(worker, args, on_error):
+    # 单个账号的异常不能让执行线程退出，否则该账号没有结果，后续账号也不再执行
+    try:
+        return worker(*args)
+    except Exception as e:
+        return on_error(e, *args)
+
+
+def _raise(e, *args):
+    raise e
+
+
+def _numbered(tasks):
+    return ((seq, args) for seq, args in enumerate(tasks))
+
+
+def _ordered(results) -> list:
+    return [results[seq] for seq in range(len(results))]
+
+
+def run_threaded(tasks, worker, concurrency, on_error=_raise) -> list:
+    """
+    使用固定数量的线程执行所有账号
+    和 ThreadPoolExecutor.map 不同，不会在开始前把所有账号一次性提交到队列中，账号来源可以是一个很大的文件
+    账号执行是阻塞的requests调用，同一时刻最多 concurrency 个账号在请求接口，也只创建这么多线程
+
+    Args:
+        tasks: 每个账号的参数元组，可以是惰性的迭代器，原样传递给worker
+        worker: 单个账号的执行函数，返回该账号的执行结果
+        concurrency: 全局并发上限
+        on_error: worker抛出异常时调用 on_error(e, *args)，返回值作为该账号的结果，默认直接抛出
+
+    Returns:
+        和tasks顺序一致的结果列表
+    """
+    concurrency = max(int(concurrency), 1)
+    results = dict()
+    tasks = _numbered(tasks)
+    lock = threading.Lock()
+    errors = []
+
+    def run_worker():
+        while True:
+            with lock:
+                item = next(tasks, None)
+            if item is None:
+                return
+            seq, args = item
+            try:
+                results[seq] = _call(worker, args, on_error)
+            except BaseException as e:
+                # 线程中的异常不会传到调用方，记录下来在所有线程结束后抛出
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=run_worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return _ordered(results)
@@ -0,0 +1,152 @@
+# -*- coding: utf8 -*-
+import csv
+import json
+import os
+
+from util.aes_help import encrypt_data, decrypt_data, bytes_to_base64, base64_to_bytes
+
+# 加密账号文件的文件头，之后每行为一个单独加密的账号记录
+ACCOUNT_FILE_HEADER = "MIMOTION-ACCOUNTS-V1"
+
+
+class Account:
+    """单个账号记录，min_step/max_step 为空时使用CONFIG中的步数配置"""
+    __slots__ = ("index", "user", "password", "min_step", "max_step")
+
+    def __init__(self, index, user, password, min_step=None, max_step=None):
+        self.index = index
+        self.user = user
+        self.password = password
+        self.min_step = min_step
+        self.max_step = max_step
+
+    @property
+    def step_range(self) -> tuple | None:
+        if self.min_step is None or self.max_step is None:
+            return None
+        return self.min_step, self.max_step
+
+
+def _optional_int(value) -> int | None:
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def parse_record(index, record: dict) -> Account:
+    """将JSON/CSV中的一条记录转换为账号，密码字段兼容 pwd/password 两种写法"""
+    user = record.get("user")
+    password = record.get("pwd", record.get("password"))
+    if user is None or password is None:
+        raise ValueError("缺少 user 或 pwd 字段")
+    return Account(index, str(user), str(password),
+                   _optional_int(record.get("min_step")), _optional_int(record.get("max_step")))
+
+
+def encrypt_record(record: dict, aes_key: bytes) -> str:
+    plain = json.dumps(record, ensure_ascii=False).encode('utf-8')
+    return bytes_to_base64(encrypt_data(plain, aes_key, None))
+
+
+class AccountSource:
+    """
+    账号来源，每次迭代都从头逐条读取，不会一次性把所有账号读入内存
+      - CONFIG中 `#` 分隔的 USER/PWD
+      - JSON Lines 文件，每行一个 {"user": "...", "pwd": "...", "min_step": 1000, "max_step": 2000}
+      - CSV 文件，表头为 user,pwd,min_step,max_step，步数列可以省略
+      - 加密文件，由 local/encrypt_accounts.py 使用AES_KEY生成，每行单独加密一条JSON记录
+    格式有误的记录会被跳过，只打印行号不打印内容
+    """
+
+    def __init__(self, path=None, users=None, passwords=None, aes_key=None):
+        self.path = path
+        self.users = users
+        self.passwords = passwords
+        self.aes_key = aes_key
+        # 文件来源在读取完之前不知道账号总数
+        self.total = None
+        if path is None:
+            user_count, passwd_count = users.count('#') + 1, passwords.count('#') + 1
+            if user_count != passwd_count:
+                raise ValueError(f"账号数长度[{user_count}]和密码数长度[{passwd_count}]不匹配，跳过执行")
+            self.total = user_count
+        elif not os.path.exists(path):
+            raise ValueError(f"账号文件不存在：{path}")
+        elif aes_key is None and self._is_encrypted():
+            raise ValueError("加密的账号文件需要配置有效的AES_KEY")
+
+    def _is_encrypted(self) -> bool:
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            return f.readline().rstrip('\r\n') == ACCOUNT_FILE_HEADER
+
+    def __iter__(self):
+        if self.path is None:
+            return self._iter_config()
+        return self._iter_file()
+
+    def _iter_config(self):
+        passwords = iter(self.passwords.split('#'))
+        for index, user in enumerate(self.users.split('#')):
+            yield Account(index, user, next(passwords))
+
+    def _iter_file(self):
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            first_line = f.readline()
+            if first_line.rstrip('\r\n') == ACCOUNT_FILE_HEADER:
+                records = self._iter_encrypted(f)
+            else:
+                f.seek(0)
+                records = self._iter_csv(f) if self.path.lower().endswith(".csv") else self._iter_jsonl(f)
+            index = 0
+            for line_num, record in records:
+                try:
+                    account = parse_record(index, record)
+                except (ValueError, TypeError, AttributeError) as e:
+                    print(f"账号文件第{line_num}行格式有误，跳过：{e}")
+                    continue
+                index += 1
+                yield account
+            self.total = index
+
+    @staticmethod
+    def _iter_csv(f):
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def _iter_jsonl(f):
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except ValueError:
+                print(f"账号文件第{line_num}行不是有效的JSON，跳过")
+
+    def _iter_encrypted(self, f):
+        for line_num, line in enumerate(f, start=2):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_num, json.loads(decrypt_data(base64_to_bytes(line), self.aes_key, None).decode('utf-8'))
+            except Exception:
+                print(f"账号文件第{line_num}行解密失败，跳过，请检查AES_KEY是否正确")
+
+    def iter_users(self):
+        """只迭代账号名，用于清理token文件中已删除的账号"""
+        for account in self:
+            yield account.user
+
+
+def open_account_source(config: dict, aes_key=None) -> AccountSource:
+    """CONFIG中配置了 ACCOUNT_FILE 时从文件读取账号，否则使用 USER/PWD"""
+    account_file = config.get('ACCOUNT_FILE')
+    if account_file:
+        return AccountSource(path=account_file, aes_key=aes_key)
+    users, passwords = config.get('USER'), config.get('PWD')
+    if users is None or passwords is None:
+        raise ValueError("未正确配置账号密码，无法执行")
+    return AccountSource(users=users, passwords=passwords)
@@ -0,0 +1,118 @@
+# -*- coding: utf8 -*-
+import threading
+import time
+from contextlib import contextmanager
+
+# 被视为服务端过载的状态码
+OVERLOAD_STATUS = (429, 500, 502, 503, 504)
+# 延迟超过基线的倍数时视为排队，开始缓慢降低并发
+LATENCY_TOLERANCE = 2.0
+# 过载时并发乘以该系数，延迟升高时乘以 LATENCY_BACKOFF
+OVERLOAD_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.9
+# 延迟的指数滑动平均系数，基线取滑动平均的最小值并以 BASELINE_DRIFT 缓慢上浮
+EWMA_ALPHA = 0.2
+BASELINE_DRIFT = 0.01
+# 并发降到1后仍然过载时，账号之间的最小间隔从这个值开始翻倍，最多到 SLEEP_GAP
+INITIAL_GAP = 0.5
+
+
+class AdaptiveLimiter:
+    """
+    按接口延迟和错误情况自动调整同时执行的账号数(AIMD)
+      - 启动时并发为1，每个成功请求+1(慢启动)，直到第一次出现过载
+      - 之后每个成功请求增加 1/并发数，即每轮增加1
+      - 429/5xx/网络异常时并发减半，延迟明显高于基线时乘以0.9，一个延迟周期内只降低一次
+      - 并发已经降到1仍然过载时，在账号之间增加间隔，最慢退化为按 SLEEP_GAP 串行执行
+    每个账号同一时刻只有一个请求在途，因此限制账号数即限制在途请求数
+    """
+
+    def __init__(self, max_limit, max_gap, min_limit=1):
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.max_gap = max(float(max_gap), 0.0)
+        self.limit = float(self.min_limit)
+        self.gap = 0.0
+        self.inflight = 0
+        self.slow_start = True
+        self.baseline = None
+        self.ewma = None
+        self.peak_limit = self.limit
+        self.decreases = 0
+        self.observed = 0
+        self._next_start = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.inflight < int(self.limit) and now >= self._next_start:
+                    break
+                # 间隔未到时按剩余时间等待，并发已满时等待有账号结束
+                wait = self._next_start - now if self.inflight < int(self.limit) else None
+                self._cond.wait(wait)
+            self.inflight += 1
+            self._next_start = time.monotonic() + self.gap
+
+    def release(self):
+        with self._cond:
+            self.inflight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, host, status, elapsed):
+        """HttpClient 每次请求结束后的回调，status为None表示网络异常"""
+        with self._cond:
+            self.observed += 1
+            if status is None or status in OVERLOAD_STATUS:
+                self._decrease(OVERLOAD_BACKOFF, elapsed)
+                return
+            self.ewma = elapsed if self.ewma is None else self.ewma + EWMA_ALPHA * (elapsed - self.ewma)
+            # 基线取平滑后延迟的最小值，避免被个别很快的请求拉低；服务端正常延迟变化后基线也能缓慢跟上
+            if self.baseline is None or self.ewma < self.baseline:
+                self.baseline = self.ewma
+            else:
+                self.baseline += BASELINE_DRIFT * (self.ewma - self.baseline)
+            if self.ewma > self.baseline * LATENCY_TOLERANCE:
+                self._decrease(LATENCY_BACKOFF, self.ewma)
+                return
+            self._increase()
+
+    def _increase(self):
+        if self.gap > 0:
+            # 先恢复账号间隔，再增加并发
+            self.gap = self.gap / 2 if self.gap / 2 >= INITIAL_GAP / 4 else 0.0
+        elif self.slow_start:
+            self.limit = min(self.limit + 1, self.max_limit)
+        else:
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+        self._cond.notify_all()
+
+    def _decrease(self, factor, period):
+        now = time.monotonic()
+        # 同一轮请求的多个失败只算一次拥塞，避免并发瞬间降到最低
+        if now - self._last_decrease < max(period, self.baseline or 0):
+            return
+        self._last_decrease = now
+        self.slow_start = False
+        self.decreases += 1
+        if self.limit > self.min_limit:
+            self.limit = max(self.limit * factor, self.min_limit)
+        elif factor == OVERLOAD_BACKOFF and self.max_gap > 0:
+            self.gap = min(max(self.gap * 2, INITIAL_GAP), self.max_gap)
+
+    def summary(self) -> str:
+        with self._cond:
+            baseline = f"{self.baseline * 1000:.0f}ms" if self.baseline is not None else "-"
+            return (f"自适应并发：当前:{int(self.limit)} 峰值:{int(self.peak_limit)} 上限:{self.max_limit} "
+                    f"降低次数:{self.decreases} 账号间隔:{self.gap:.2f}s 延迟基线:{baseline} 请求数:{self.observed}")
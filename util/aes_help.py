@@ -1,5 +1,3 @@
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
 import base64
 
 # 华米传输加密使用的密钥 固定iv
@@ -7,7 +5,8 @@ import base64
 HM_AES_KEY = b'xeNtBVqzDc6tuNTh'  # 16 bytes
 HM_AES_IV = b'MAAAYAAAAAAAAABg'  # 16 bytes
 
-AES_BLOCK_SIZE = AES.block_size  # 16
+# pycryptodome 在第一次加解密时才导入，只读取配置或合并结果时不需要加载
+AES_BLOCK_SIZE = 16
 
 
 def _pkcs7_pad(data: bytes) -> bytes:
@@ -44,9 +43,11 @@ def encrypt_data(plain: bytes, key: bytes, iv: bytes | None = None) -> bytes:
     _validate_key(key)
     if not isinstance(plain, (bytes, bytearray)):
         raise TypeError("plain must be bytes")
+    from Crypto.Cipher import AES
 
     if iv is None:
         # 使用随机IV
+        from Crypto.Random import get_random_bytes
         iv = get_random_bytes(AES_BLOCK_SIZE)
         cipher = AES.new(key, AES.MODE_CBC, iv)
         padded = _pkcs7_pad(plain)
@@ -70,6 +71,7 @@ def decrypt_data(data: bytes, key: bytes, iv: bytes | None = None) -> bytes:
     _validate_key(key)
     if not isinstance(data, (bytes, bytearray)):
         raise TypeError("data must be bytes")
+    from Crypto.Cipher import AES
 
     if iv is None:
         # 从数据中提取IV（假设前16字节是IV）
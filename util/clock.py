@@ -0,0 +1,21 @@
+# -*- coding: utf8 -*-
+import time
+from datetime import datetime, timedelta, timezone
+
+# 北京时间，1991年以后没有夏令时，固定为UTC+8，只创建一次，不需要每次通过pytz查找时区
+BEIJING_TZ = timezone(timedelta(hours=8), "Asia/Shanghai")
+
+
+def get_beijing_time() -> datetime:
+    """获取北京时间"""
+    return datetime.now(BEIJING_TZ)
+
+
+def format_now() -> str:
+    """格式化当前时间"""
+    return get_beijing_time().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def get_time() -> str:
+    """当前的毫秒时间戳，和时区无关"""
+    return "%.0f" % (time.time() * 1000)
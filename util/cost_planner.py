@@ -0,0 +1,148 @@
+# -*- coding: utf8 -*-
+import heapq
+import json
+import os
+import threading
+
+# 没有历史数据时各阶段的耗时估计值，单位秒
+DEFAULT_STAGE_LATENCY = 0.5
+# 历史耗时的平滑系数，新一次执行的平均耗时占的比重
+LATENCY_ALPHA = 0.3
+# 各阶段耗时和文件中保存的值相差不超过这个比例时不重写文件，避免每次执行都产生新的提交
+SAVE_TOLERANCE = 0.2
+# 排序窗口为并发数的倍数，每次只预读一个窗口的账号，不需要读取全部账号和解密全部token
+LOOKAHEAD_PER_WORKER = 4
+
+# 各级token均失效时的完整登录流程
+PASSWORD_STAGES = ["login_access_token", "grant_login_tokens", "band_data"]
+
+
+def account_stages(token_info, lifecycle) -> list:
+    """
+    根据保存的token签发时间预测账号需要调用的接口，和 MiMotionRunner.login 的顺序保持一致
+    """
+    if token_info is None:
+        return PASSWORD_STAGES
+    if lifecycle.is_fresh("app_token", token_info.get("app_token_time")):
+        return ["band_data"]
+    stages = ["check_app_token"]
+    if _likely_valid(lifecycle, "app_token", token_info.get("app_token_time")):
+        return stages + ["band_data"]
+    stages.append("grant_app_token")
+    if _likely_valid(lifecycle, "login_token", token_info.get("login_token_time")):
+        return stages + ["band_data"]
+    stages.append("grant_login_tokens")
+    if _likely_valid(lifecycle, "access_token", token_info.get("access_token_time")):
+        return stages + ["band_data"]
+    return stages + PASSWORD_STAGES
+
+
+def _likely_valid(lifecycle, tier, token_time) -> bool:
+    age = lifecycle.age_of(token_time)
+    return age is not None and age < lifecycle.estimated_lifetime(tier)
+
+
+def list_schedule(costs, workers) -> float:
+    """按给定顺序把任务依次分配给最先空闲的worker，返回全部完成的时间"""
+    finish = [0.0] * max(int(workers), 1)
+    for cost in costs:
+        heapq.heappush(finish, heapq.heappop(finish) + cost)
+    return max(finish)
+
+
+class CostPlanner:
+    """
+    按预测耗时安排账号的执行顺序
+      - 保存每个接口阶段的历史平均耗时，不包含任何账号信息
+      - 每个账号的预测耗时为预计调用的各阶段耗时之和
+      - 耗时长的账号先执行(LPT)，固定数量的worker并行时整体完成时间更早
+      - 只在有限的预读窗口内排序，账号仍然按需读取，读到第一个窗口的账号就开始执行
+      - 执行结束后对比预测耗时和实际耗时，并用本次的阶段耗时更新历史数据
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        # 阶段 -> 平均耗时(秒)
+        self._latency = dict()
+        # 文件中保存的阶段耗时
+        self._saved = dict()
+        # 本次执行按排序后和按原顺序的预测耗时
+        self._planned_costs = []
+        self._original_costs = []
+        self._lock = threading.Lock()
+
+    def load(self):
+        """读取历史阶段耗时，文件不存在或损坏时使用默认值"""
+        if self.path is None or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._latency = {stage: float(latency) for stage, latency in data.get("stage_latency", {}).items()}
+            self._saved = dict(self._latency)
+        except Exception as e:
+            print(f"读取历史阶段耗时失败，使用默认值: {e}")
+        return self
+
+    def save(self) -> bool:
+        """保存历史阶段耗时，和文件中的值相差不大时不写入，返回是否写入了文件"""
+        if self.path is None:
+            return False
+        with self._lock:
+            if all(stage in self._saved and abs(latency - self._saved[stage]) <= self._saved[stage] * SAVE_TOLERANCE
+                   for stage, latency in self._latency.items()):
+                return False
+            data = {"stage_latency": {stage: round(latency, 4) for stage, latency in self._latency.items()}}
+            self._saved = dict(self._latency)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return True
+
+    def stage_cost(self, stage) -> float:
+        with self._lock:
+            return self._latency.get(stage, DEFAULT_STAGE_LATENCY)
+
+    def estimate(self, stages) -> float:
+        """预计调用的各阶段耗时之和"""
+        return sum(self.stage_cost(stage) for stage in stages)
+
+    def plan(self, tasks, workers, window=None):
+        """
+        tasks 为 (预测耗时, 任务) 的可迭代对象，按需读取，每次预读 window 个任务
+        在窗口内按预测耗时从长到短排序后依次返回，内存中最多只保留一个窗口的任务
+        """
+        window = window or max(int(workers), 1) * LOOKAHEAD_PER_WORKER
+        self._planned_costs, self._original_costs = [], []
+        buffer = []
+        for item in tasks:
+            buffer.append(item)
+            if len(buffer) >= window:
+                yield from self._drain(buffer)
+        yield from self._drain(buffer)
+
+    def _drain(self, buffer):
+        self._original_costs.extend(cost for cost, _ in buffer)
+        buffer.sort(key=lambda item: -item[0])
+        self._planned_costs.extend(cost for cost, _ in buffer)
+        items = list(buffer)
+        buffer.clear()
+        for _, task in items:
+            yield task
+
+    def prediction(self, workers) -> (int, float, float):
+        """已排序的任务数，以及排序后和按原顺序执行的预测完成时间"""
+        return (len(self._planned_costs), list_schedule(self._planned_costs, workers),
+                list_schedule(self._original_costs, workers))
+
+    def update(self, stage_summary: dict):
+        """使用 RunMetrics.stage_summary 的结果更新历史阶段耗时"""
+        with self._lock:
+            for stage, item in stage_summary.items():
+                if not item["count"]:
+                    continue
+                latency = item["total_ms"] / item["count"] / 1000
+                previous = self._latency.get(stage)
+                if previous is None:
+                    self._latency[stage] = latency
+                else:
+                    self._latency[stage] = previous + LATENCY_ALPHA * (latency - previous)
@@ -0,0 +1,39 @@
+# -*- coding: utf8 -*-
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """剩余时间不足，请求未发起或不再重试，和requests的网络异常一样是IOError的子类"""
+
+
+class Deadline:
+    """
+    执行的截止时间
+      - 使用单调时钟，不受系统时间调整影响
+      - 每个账号的截止时间由整次执行的截止时间派生，不会晚于整次执行的截止时间
+      - 传入接口请求后，单次请求的超时时间不超过剩余时间，剩余时间不足时不再重试
+    """
+    __slots__ = ("expires",)
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def child(self, seconds) -> "Deadline":
+        """派生一个不晚于当前截止时间的子截止时间，seconds 为空时和当前截止时间相同"""
+        deadline = Deadline(0 if seconds is None else seconds)
+        if seconds is None or deadline.expires > self.expires:
+            deadline.expires = self.expires
+        return deadline
+
+    def cap(self, timeout) -> float:
+        """单次请求可用的超时时间，已超过截止时间时抛出 DeadlineExceeded"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("已超过执行时限，跳过请求")
+        return remaining if timeout is None else min(timeout, remaining)
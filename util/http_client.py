@@ -0,0 +1,315 @@
+# -*- coding: utf8 -*-
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from util.deadline import DeadlineExceeded
+
+# 默认超时时间(秒)，所有请求统一使用，避免某个接口无响应时一直挂起
+DEFAULT_TIMEOUT = 10
+# 默认每个host的连接池大小
+DEFAULT_POOL_SIZE = 10
+# 临时性错误的默认重试次数，不包括第一次请求
+DEFAULT_RETRIES = 2
+# 重试退避的基础时间和上限(秒)，实际等待时间在 [0, min(上限, 基础时间*2^n)] 之间随机
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 4
+# 需要重试的响应状态码
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# 幂等的请求方法，重复发送不会产生副作用，可以在5xx和读取超时后重试
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# 连续失败达到该次数后熔断
+BREAKER_THRESHOLD = 5
+# 熔断持续时间(秒)，之后放行一次探测请求，探测失败则继续熔断
+BREAKER_COOLDOWN = 60
+
+
+class CircuitOpenError(IOError):
+    """host已熔断，请求直接失败，和requests的网络异常一样是IOError的子类"""
+
+
+class HostHealth:
+    """
+    单个host的健康状态
+      - 5xx或网络异常计为失败，连续失败达到阈值后熔断，熔断期间请求直接失败
+      - 熔断持续一段时间后放行一次探测请求，成功则恢复，失败则继续熔断
+      - 统计请求数、失败数、重试数以及熔断拒绝的请求数
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+        self.opened_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self.probing else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                self.requests += 1
+                return True
+            if not self.probing and time.monotonic() - self.opened_at >= self.cooldown:
+                self.probing = True
+                self.requests += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.probing or (self.opened_at is None and self.consecutive_failures >= self.threshold):
+                if self.opened_at is None:
+                    self.opened_count += 1
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+    def record_abandoned(self):
+        # 请求因截止时间放弃，不代表host异常，既不计为失败也不计为成功，只释放探测名额
+        with self._lock:
+            self.probing = False
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "requests": self.requests, "failures": self.failures,
+                    "retries": self.retries, "rejected": self.rejected, "opened": self.opened_count}
+
+
+def _requests():
+    # requests导入耗时占启动时间的大头，首次发起请求时才导入，不需要请求接口的执行可以省去这部分时间
+    import requests
+    return requests
+
+
+def _never_sent(error) -> bool:
+    """连接未建立的网络异常，请求没有发送到服务端，非幂等请求也可以安全重试"""
+    requests = _requests()
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or isinstance(error, requests.exceptions.Timeout):
+        return False
+    from urllib3.exceptions import NewConnectionError
+    # requests 将 urllib3 的 MaxRetryError 包装为 ConnectionError，reason 为实际的异常
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _host_key(url) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class HttpClient:
+    """
+    共享的HTTP客户端
+      - 每个host单独挂载一个连接池，大小和并发线程数保持一致
+      - 多个账号之间复用keep-alive连接，避免每次请求重新进行TCP和TLS握手，不保存cookie
+      - 每个host的公共请求头只构建一次，请求时仅合并动态字段
+      - 所有请求统一设置超时时间，传入截止时间时超时时间不超过剩余时间
+      - 可选的单host并发上限，避免同时对同一个host发起过多请求
+      - 5xx/429以及网络异常时按随机退避有限次重试，非幂等请求只在连接未建立时重试，host持续失败时熔断快速失败
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.host_limit = None
+        self.retries = DEFAULT_RETRIES
+        # 首次请求时才创建
+        self._session = None
+        self._host_headers = dict()
+        self._host_semaphores = dict()
+        self._host_health = dict()
+        self._observers = []
+        self._lock = threading.Lock()
+
+    def register_host(self, base_url, headers=None):
+        """
+        注册host并挂载独立的连接池，headers为该host的公共请求头
+        base_url 可以带路径前缀，用于将多个host映射到同一个本地模拟服务
+        """
+        host = base_url.rstrip('/')
+        with self._lock:
+            self._host_headers[host] = dict(headers or {})
+            self._host_health[host] = HostHealth()
+            self._mount(host)
+            if self.host_limit:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.host_limit)
+
+    def configure(self, pool_size=None, timeout=None, host_limit=None, retries=None):
+        """按并发数调整连接池大小、超时时间、单host并发上限以及重试次数，需要在开始请求前调用"""
+        with self._lock:
+            if timeout is not None:
+                self.timeout = timeout
+            if retries is not None:
+                self.retries = max(int(retries), 0)
+            if host_limit is not None:
+                self.host_limit = max(int(host_limit), 1)
+                self._host_semaphores = {host: threading.BoundedSemaphore(self.host_limit)
+                                         for host in self._host_headers}
+            if pool_size is not None and pool_size != self.pool_size:
+                self.pool_size = max(int(pool_size), 1)
+                for host in self._host_headers:
+                    self._mount(host)
+
+    def _get_session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    from http.cookiejar import DefaultCookiePolicy
+                    session = _requests().Session()
+                    # 会话在所有账号之间共享，不保存服务端下发的cookie，避免一个账号的cookie被带到其他账号的请求中
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    self._session = session
+                    for host in self._host_headers:
+                        self._mount(host)
+        return self._session
+
+    def _mount(self, host):
+        if self._session is None:
+            return
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        old_adapter = self._session.adapters.get(host + "/")
+        self._session.mount(host + "/", adapter)
+        if old_adapter is not None:
+            old_adapter.close()
+
+    def _match_host(self, url):
+        host = _host_key(url)
+        if host in self._host_headers:
+            return host
+        for prefix in self._host_headers:
+            if url.startswith(prefix + "/"):
+                return prefix
+        return host
+
+    def _build_headers(self, host, headers):
+        base_headers = self._host_headers.get(host)
+        if not base_headers:
+            return headers
+        if not headers:
+            return base_headers
+        return {**base_headers, **headers}
+
+    def request(self, method, url, headers=None, timeout=None, deadline=None, idempotent=None,
+                **kwargs) -> "requests.Response":
+        """
+        deadline 为 Deadline 时，单次请求的超时时间不超过剩余时间，剩余时间不足以退避后再请求时不再重试
+        idempotent 为空时按请求方法判断，非幂等请求(例如登录、提交步数的POST)可能已被服务端处理，
+        只在连接未建立时重试，不在5xx、429和读取超时后重试；调用方确认可以重复发送时传入True
+        """
+        requests = _requests()
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        host = self._match_host(url)
+        health = self._host_health.get(host)
+        if health is None:
+            with self._lock:
+                health = self._host_health.setdefault(host, HostHealth())
+        attempt = 0
+        while True:
+            request_timeout = self.timeout if timeout is None else timeout
+            attempt_timeout = request_timeout if deadline is None else deadline.cap(request_timeout)
+            # 按剩余时间缩短了超时时间时，超时是因为截止时间而不是host异常
+            capped = attempt_timeout < request_timeout
+            if not health.allow():
+                raise CircuitOpenError(f"{host} 已熔断，跳过请求")
+            # full jitter 退避，避免大量账号同时重试
+            backoff = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** (attempt + 1))))
+            begin = time.perf_counter()
+            try:
+                response = self._send_limited(method, url, host, headers, attempt_timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if capped and isinstance(e, requests.exceptions.Timeout):
+                    health.record_abandoned()
+                    raise DeadlineExceeded(f"已超过执行时限，请求超时：{e}") from e
+                health.record_failure()
+                self._notify(host, None, time.perf_counter() - begin)
+                if not (idempotent or _never_sent(e)) or not self._can_retry(attempt, backoff, deadline):
+                    raise
+            except requests.exceptions.RequestException:
+                # 其他请求异常(例如响应分块错误、重定向过多)同样计为失败，保证半开状态的探测名额被释放
+                health.record_failure()
+                self._notify(host, None, time.perf_counter() - begin)
+                raise
+            except BaseException:
+                # 请求以外的异常(例如被中断)不代表host异常，只释放探测名额
+                health.record_abandoned()
+                raise
+            else:
+                self._notify(host, response.status_code, time.perf_counter() - begin)
+                if response.status_code < 500:
+                    health.record_success()
+                else:
+                    health.record_failure()
+                if not idempotent or response.status_code not in RETRY_STATUS \
+                        or not self._can_retry(attempt, backoff, deadline):
+                    return response
+                response.close()
+            attempt += 1
+            health.record_retry()
+            time.sleep(backoff)
+
+    def _can_retry(self, attempt, backoff, deadline) -> bool:
+        return attempt < self.retries and (deadline is None or deadline.remaining() > backoff)
+
+    def add_observer(self, observer):
+        """注册请求结果回调 observer(host, status_code, elapsed)，网络异常时status_code为None"""
+        self._observers.append(observer)
+
+    def _notify(self, host, status, elapsed):
+        for observer in self._observers:
+            observer(host, status, elapsed)
+
+    def _send_limited(self, method, url, host, headers, timeout, **kwargs) -> "requests.Response":
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            return self._send(method, url, host, headers, timeout, **kwargs)
+        with semaphore:
+            return self._send(method, url, host, headers, timeout, **kwargs)
+
+    def health_summary(self) -> dict:
+        """各host的熔断状态和重试统计，只包含有过请求的host"""
+        return {host.split("://", 1)[-1]: health.to_dict()
+                for host, health in list(self._host_health.items()) if health.requests or health.rejected}
+
+    def _send(self, method, url, host, headers, timeout, **kwargs) -> "requests.Response":
+        return self._get_session().request(method, url,
+                                           headers=self._build_headers(host, headers),
+                                           timeout=self.timeout if timeout is None else timeout,
+                                           **kwargs)
+
+    def get(self, url, **kwargs) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> "requests.Response":
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,126 @@
+# -*- coding: utf8 -*-
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+# 采样间隔，单位秒
+DEFAULT_INTERVAL = 0.01
+# tracemalloc 为每次内存分配保存的调用栈层数，只按代码行统计时1层即可，层数越多开销越大
+TRACEMALLOC_FRAMES = 1
+# 内存分配表展示的行数
+TOP_ALLOCATIONS = 15
+
+
+def _thread_group(name) -> str:
+    # 线程池中的线程名带有序号，去掉序号后合并为同一组
+    return re.sub(r"[-_]\d+", "", name)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RunProfiler:
+    """
+    整个执行过程的性能分析
+      - 后台线程定时采样所有线程的调用栈，输出折叠栈格式(collapsed stacks)，可直接用于 flamegraph.pl 或 speedscope
+      - 使用 tracemalloc 在各阶段结束时记录内存快照，输出每个阶段新增内存最多的代码行
+      - 只在 --profile 时启用，不影响正常执行
+    """
+
+    def __init__(self, output_dir, interval=DEFAULT_INTERVAL):
+        self.output_dir = output_dir
+        self.interval = interval
+        # 折叠栈 -> 采样次数
+        self._stacks = dict()
+        self._samples = 0
+        # (阶段, 当前内存, 峰值内存, 耗时, 新增内存最多的代码行)
+        self._stages = []
+        self._snapshot = None
+        self._stage_started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._stage_started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample_loop(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(_thread_group(names.get(ident, str(ident))))
+                key = ";".join(reversed(stack))
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+            self._samples += 1
+
+    def mark(self, stage):
+        """记录一个阶段结束时的内存快照，和上一个阶段比较新增的内存"""
+        # 阶段耗时不包含拍摄和比较快照的时间
+        elapsed = time.perf_counter() - self._stage_started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        # 按代码行汇总后再排除分析工具自身的内存，比逐条过滤内存分配快得多
+        top = [stat for stat in snapshot.compare_to(self._snapshot, "lineno")
+               if stat.traceback[0].filename not in (__file__, tracemalloc.__file__)][:TOP_ALLOCATIONS]
+        self._stages.append((stage, current, peak, elapsed, top))
+        self._snapshot = snapshot
+        # 比较快照本身分配的内存不计入下一个阶段的峰值
+        tracemalloc.reset_peak()
+        self._stage_started = time.perf_counter()
+
+    def stop(self) -> (str, str):
+        """停止采样并输出结果文件，返回折叠栈文件和内存报告文件的路径"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        tracemalloc.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        stacks_path = os.path.join(self.output_dir, "profile.collapsed")
+        with open(stacks_path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self._stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+        memory_path = os.path.join(self.output_dir, "profile_memory.txt")
+        with open(memory_path, "w", encoding="utf-8") as f:
+            f.write(self.format_memory_report())
+        return stacks_path, memory_path
+
+    def format_hotspots(self, top=15) -> str:
+        """采样中处于栈顶次数最多的函数"""
+        leaves = dict()
+        for stack, count in self._stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        total = sum(leaves.values()) or 1
+        lines = [f"采样{self._samples}次，栈顶耗时最多的函数(包含等待)："]
+        for leaf, count in sorted(leaves.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"  {count / total * 100:6.2f}% {count:>7} {leaf}")
+        return "\n".join(lines)
+
+    def format_memory_report(self) -> str:
+        lines = ["各阶段内存(MB)："]
+        for stage, current, peak, elapsed, _ in self._stages:
+            lines.append(f"  {stage:<16} 当前:{current / 1024 / 1024:8.2f} 峰值:{peak / 1024 / 1024:8.2f} "
+                         f"耗时:{elapsed:8.2f}s")
+        for stage, _, _, _, top in self._stages:
+            lines.append(f"\n{stage} 阶段新增内存最多的代码行：")
+            for stat in top:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:+10.1f}KB {stat.count_diff:+8}个 "
+                             f"{frame.filename}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
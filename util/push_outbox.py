@@ -0,0 +1,240 @@
+# -*- coding: utf8 -*-
+import hashlib
+import json
+import os
+import threading
+import time
+
+from util.aes_help import encrypt_data, decrypt_data, bytes_to_base64, base64_to_bytes
+from util.push_util import PushReport, configured_channels, build_channel_job, dispatch_channel_jobs
+
+# 文件头，之后一行为整个队列加密后的内容
+OUTBOX_HEADER = "MIMOTION-PUSH-OUTBOX-V1"
+# 单个渠道最多保留的待推送报告数，超过时丢弃最早的
+MAX_PENDING_REPORTS = 10
+# 单个报告最多尝试推送的执行次数，超过后丢弃
+MAX_ATTEMPTS = 5
+# 保留的已完成执行ID数量，用于去重
+MAX_FINISHED_IDS = 50
+
+
+class PushOutbox:
+    """
+    持久化的推送队列
+      - 每次执行的报告只渲染一次，按渠道放入队列，由后台线程推送，执行线程不等待推送结果
+      - 推送失败的报告保留在队列中，下次执行时重新推送，超过最大尝试次数后丢弃
+      - 按执行ID去重，同一次执行重复入队时只推送一次，例如在Actions中重新运行合并任务
+        已推送完成的执行ID只保存在内存中，队列中仍有该执行的报告时按队列去重
+      - 同一渠道有多个待推送的报告时合并为一条消息，按执行顺序展示
+      - 多页的报告只推送成功部分分页时，记录分页内容和已推送的分页序号，之后从未推送的分页继续，不再和其他报告合并
+      - 配置了AES_KEY时加密保存到文件，内容没有变化时不写入，队列清空后删除文件，推送成功的执行不会改变仓库中的文件
+        path 为 None 时仅在内存中保存
+    """
+
+    def __init__(self, path, aes_key):
+        self.path = path
+        self.aes_key = aes_key
+        # 待推送的报告：run_id/channel/report/created/attempts
+        # 部分推送成功的报告另有 pages/sent 为分页内容和已推送的分页序号，merged 为一起合并推送的其他执行ID
+        self._pending = []
+        # 本进程中已推送或已放弃的执行ID，不写入文件
+        self._finished = []
+        self._digest = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header, _, cipher = f.read().partition('\n')
+            if header != OUTBOX_HEADER:
+                raise ValueError("文件头不正确")
+            data = json.loads(decrypt_data(base64_to_bytes(cipher.strip()), self.aes_key, None).decode('utf-8'))
+        except Exception as e:
+            print(f"读取推送队列失败，放弃未推送的报告：{e}")
+            return self
+        self._pending = data.get("pending", [])
+        self._digest = self._state_digest()
+        return self
+
+    def _state_digest(self) -> str:
+        origin_str = json.dumps({"pending": self._pending}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(origin_str.encode('utf-8')).hexdigest()
+
+    def save(self) -> bool:
+        """保存队列，内容没有变化时不写入，队列为空时删除文件，返回是否改变了文件"""
+        with self._lock:
+            if self.path is None:
+                return False
+            if not self._pending:
+                self._digest = self._state_digest()
+                if not os.path.exists(self.path):
+                    return False
+                os.remove(self.path)
+                return True
+            digest = self._state_digest()
+            if digest == self._digest:
+                return False
+            origin_str = json.dumps({"pending": self._pending}, ensure_ascii=False)
+            cipher = bytes_to_base64(encrypt_data(origin_str.encode('utf-8'), self.aes_key, None))
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(OUTBOX_HEADER + '\n' + cipher + '\n')
+            os.replace(tmp_path, self.path)
+            self._digest = digest
+            return True
+
+    def enqueue(self, run_id, report: PushReport, channels) -> int:
+        """将一次执行的报告放入各渠道的队列，返回入队的渠道数"""
+        with self._lock:
+            if run_id in self._finished:
+                print(f"执行{run_id}的报告已经推送过，不再重复推送")
+                return 0
+            queued = 0
+            for channel in channels:
+                if any(run_id in _run_ids(item) and item["channel"] == channel for item in self._pending):
+                    continue
+                self._pending.append({"run_id": run_id, "channel": channel, "report": report.to_dict(),
+                                      "created": time.time(), "attempts": 0})
+                queued += 1
+                items = [item for item in self._pending if item["channel"] == channel]
+                if len(items) > MAX_PENDING_REPORTS:
+                    print(f"{channel}待推送的报告超过{MAX_PENDING_REPORTS}个，丢弃最早的报告")
+                    self._pending.remove(items[0])
+            return queued
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return len(self._pending) > 0
+
+    def deliver(self, config) -> dict:
+        """
+        推送队列中的报告，返回每个渠道的推送状态
+        同一渠道已推送部分分页的报告先推送剩余分页，其他报告合并为一条消息推送
+        """
+        with self._lock:
+            groups = dict()
+            for item in sorted(self._pending, key=lambda x: x["created"]):
+                groups.setdefault(item["channel"], []).append(item)
+        channels = configured_channels(config, verbose=False)
+        jobs = []
+        units = dict()
+        for channel, items in groups.items():
+            if channel not in channels:
+                continue
+            units[channel] = self._build_units(channel, items, config)
+            # 每个分页附带所属的单元和序号，推送后据此记录已推送的分页
+            pages = [(unit, idx, page) for unit in units[channel]
+                     for idx, page in enumerate(unit["pages"]) if idx not in unit["sent"]]
+            jobs.append((channel, lambda page, timeout: page[0]["send"](page[2], timeout), pages))
+        channel_results = dispatch_channel_jobs(jobs, config.push_timeout)
+        pages_by_channel = {channel: pages for channel, _, pages in jobs}
+        with self._lock:
+            for channel, items in groups.items():
+                if channel not in channels:
+                    print(f"{channel}已不再配置，丢弃{len(items)}个待推送的报告")
+                    self._remove(items)
+                    continue
+                for position in channel_results.get(channel, {}).get("delivered", []):
+                    unit, idx, _ = pages_by_channel[channel][position]
+                    unit["sent"].add(idx)
+                for unit in units[channel]:
+                    self._settle(channel, unit)
+            # 所有渠道都已推送或放弃的执行记为已完成
+            pending_ids = set(run_id for item in self._pending for run_id in _run_ids(item))
+            for items in groups.values():
+                for item in items:
+                    for run_id in _run_ids(item):
+                        if run_id not in pending_ids and run_id not in self._finished:
+                            self._finished.append(run_id)
+            del self._finished[:-MAX_FINISHED_IDS]
+            remaining = len(self._pending)
+        if remaining:
+            print(f"{remaining}个报告推送失败，保留到下次执行时重新推送")
+        return channel_results
+
+    @staticmethod
+    def _build_units(channel, items, config) -> list:
+        """
+        按推送顺序生成一个渠道的推送单元：items/send/pages/sent
+        已推送部分分页的报告各自为一个单元，使用保存的分页内容；其余报告合并为一个单元
+        """
+        units = []
+        unsent = []
+        for item in items:
+            if not item.get("sent"):
+                unsent.append(item)
+                continue
+            _, send_page, _ = build_channel_job(channel, PushReport.from_dict(item["report"]), config)
+            units.append({"items": [item], "send": send_page, "pages": item["pages"], "sent": set(item["sent"])})
+        if unsent:
+            if len(unsent) > 1:
+                print(f"{channel}有{len(unsent) - 1}个之前未推送成功的报告，合并为一条消息推送")
+            report = PushReport.coalesce([PushReport.from_dict(item["report"]) for item in unsent])
+            _, send_page, pages = build_channel_job(channel, report, config)
+            units.append({"items": unsent, "report": report, "send": send_page, "pages": pages, "sent": set()})
+        return units
+
+    def _settle(self, channel, unit):
+        """根据推送结果更新队列，调用时需持有锁"""
+        items = unit["items"]
+        if len(unit["sent"]) >= len(unit["pages"]):
+            self._remove(items)
+            return
+        if unit["sent"] and not items[0].get("sent"):
+            # 合并推送的报告只推送成功了部分分页，合并为一条记录，保存分页内容以便之后继续
+            first = items[0]
+            first["report"] = unit["report"].to_dict()
+            first["merged"] = [run_id for item in items[1:] for run_id in _run_ids(item)]
+            first["pages"] = unit["pages"]
+            first["attempts"] = max(item["attempts"] for item in items)
+            self._remove(items[1:])
+            items = [first]
+        if unit["sent"]:
+            items[0]["sent"] = sorted(unit["sent"])
+            print(f"{channel}已推送{len(unit['sent'])}/{len(unit['pages'])}页，剩余分页下次继续推送")
+        for item in items:
+            item["attempts"] += 1
+            if item["attempts"] >= MAX_ATTEMPTS:
+                print(f"执行{item['run_id']}的报告推送到{channel}失败{MAX_ATTEMPTS}次，放弃推送")
+                self._remove([item])
+
+    def _remove(self, items):
+        for item in items:
+            # 推送期间可能因为超过单渠道的最大报告数已被移除
+            if item in self._pending:
+                self._pending.remove(item)
+
+    def _deliver_and_save(self, config):
+        try:
+            self.deliver(config)
+        except Exception as e:
+            print(f"推送报告异常：{e}")
+        try:
+            self.save()
+        except Exception as e:
+            print(f"保存推送队列失败：{e}")
+
+    def deliver_async(self, config):
+        """在后台线程中推送并保存队列，上一次推送尚未结束时先等待其结束"""
+        self.wait()
+        self._thread = threading.Thread(target=self._deliver_and_save, args=(config,), name="push-outbox")
+        self._thread.start()
+
+    def wait(self, timeout=None) -> bool:
+        """等待后台推送结束，返回是否已结束"""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
+
+
+def _run_ids(item) -> list:
+    """队列中一条记录包含的执行ID，合并推送过部分分页的记录包含多个"""
+    return [item["run_id"]] + item.get("merged", [])
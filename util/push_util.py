@@ -1,19 +1,12 @@
 import json
 import re
-import requests
-from datetime import datetime
-import pytz
+import time
+import concurrent.futures
 
+from util.clock import get_beijing_time, format_now
 
-def get_beijing_time():
-    """获取北京时间"""
-    target_timezone = pytz.timezone('Asia/Shanghai')
-    return datetime.now().astimezone(target_timezone)
-
-
-def format_now():
-    """格式化当前时间"""
-    return get_beijing_time().strftime("%Y-%m-%d %H:%M:%S")
+# 单个推送渠道的默认超时时间(秒)，包括该渠道所有分页消息
+DEFAULT_PUSH_TIMEOUT = 10
 
 
 def format_date_hm():
@@ -33,17 +26,20 @@ class PushConfig:
                  push_plus_max=30,
                  push_wechat_webhook_key=None,
                  telegram_bot_token=None,
-                 telegram_chat_id=None):
+                 telegram_chat_id=None,
+                 push_timeout=DEFAULT_PUSH_TIMEOUT):
         self.push_plus_token = push_plus_token
         self.push_plus_hour = push_plus_hour
         self.push_plus_max = int(push_plus_max) if push_plus_max else 30
         self.push_wechat_webhook_key = push_wechat_webhook_key
         self.telegram_bot_token = telegram_bot_token
         self.telegram_chat_id = telegram_chat_id
+        self.push_timeout = float(push_timeout) if push_timeout else DEFAULT_PUSH_TIMEOUT
 
 
-def push_plus(token, title, content):
+def push_plus(token, title, content, timeout=DEFAULT_PUSH_TIMEOUT) -> bool:
     """推送到PushPlus"""
+    import requests
     requestUrl = f"http://www.pushplus.plus/send"
     data = {
         "token": token,
@@ -53,20 +49,23 @@ def push_plus(token, title, content):
         "channel": "wechat"
     }
     try:
-        response = requests.post(requestUrl, data=data)
+        response = requests.post(requestUrl, data=data, timeout=timeout)
         if response.status_code == 200:
             json_res = response.json()
             print(f"pushplus推送完毕：{json_res['code']}-{json_res['msg']}")
+            return json_res.get('code') == 200
         else:
             print("pushplus推送失败")
     except requests.exceptions.RequestException as e:
         print(f"pushplus推送网络异常: {e}")
     except Exception as e:
         print(f"pushplus推送未知异常: {e}")
+    return False
 
 
-def push_wechat_webhook(key, title, content):
+def push_wechat_webhook(key, title, content, timeout=DEFAULT_PUSH_TIMEOUT) -> bool:
     """推送到企业微信"""
+    import requests
     requestUrl = f"https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key={key}"
     payload = {
         "msgtype": "markdown_v2",
@@ -75,11 +74,12 @@ def push_wechat_webhook(key, title, content):
         }
     }
     try:
-        response = requests.post(requestUrl, json=payload)
+        response = requests.post(requestUrl, json=payload, timeout=timeout)
         if response.status_code == 200:
             json_res = response.json()
             if json_res.get('errcode') == 0:
                 print(f"企业微信推送完毕：{json_res['errmsg']}")
+                return True
             else:
                 print(f"企业微信推送失败：{json_res.get('errmsg', '未知错误')}")
         else:
@@ -88,14 +88,16 @@ def push_wechat_webhook(key, title, content):
         print(f"企业微信推送异常: {e}")
     except Exception as e:
         print(f"企业微信推送发生未知异常: {e}")
+    return False
 
 
 def buildWeChatContent(title, content) -> str:
     return f"""# {title}\n{content}"""
 
 
-def push_telegram_bot(bot_token, chat_id, content):
+def push_telegram_bot(bot_token, chat_id, content, timeout=DEFAULT_PUSH_TIMEOUT) -> bool:
     """推送到Telegram"""
+    import requests
     requestUrl = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload = {
         "chat_id": int(chat_id),
@@ -105,11 +107,12 @@ def push_telegram_bot(bot_token, chat_id, content):
     print(f"post to url: {requestUrl}")
     print(f"payload: {json.dumps(payload)}")
     try:
-        response = requests.post(requestUrl, json=payload)
+        response = requests.post(requestUrl, json=payload, timeout=timeout)
         if response.status_code == 200:
             json_res = response.json()
             if json_res.get('ok') is True:
                 print(f"telegram bot推送完毕：{json_res['result']['message_id']}")
+                return True
             else:
                 print(f"telegram bot推送失败: {json.dumps(json_res)}")
         else:
@@ -118,15 +121,64 @@ def push_telegram_bot(bot_token, chat_id, content):
         print(f"telegram bot推送异常: {e}")
     except Exception as e:
         print(f"telegram bot推送发生未知异常: {e}")
+    return False
 
 
-def push_results(exec_results, summary, config: PushConfig):
-    """推送所有结果"""
+def push_results(exec_results, summary, config: PushConfig) -> dict:
+    """推送所有结果，返回每个渠道的推送状态和耗时"""
     if not_in_push_time_range(config):
-        return
-    push_to_push_plus(exec_results, summary, config)
-    push_to_wechat_webhook(exec_results, summary, config)
-    push_to_telegram_bot(exec_results, summary, config)
+        return {}
+    # 只渲染一次，各渠道按自身长度限制分页
+    report = render_report(exec_results, summary, config.push_plus_max)
+    jobs = build_channel_jobs(report, config)
+    return dispatch_channel_jobs(jobs, config.push_timeout)
+
+
+def _deliver_channel(send_page, pages, deadline) -> dict:
+    """按顺序发送一个渠道的所有分页，超过截止时间后放弃剩余分页，delivered 为发送成功的分页序号"""
+    start = time.perf_counter()
+    sent, ok = 0, True
+    delivered = []
+    for idx, page in enumerate(pages):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            ok = False
+            break
+        if send_page(page, remaining):
+            delivered.append(idx)
+        else:
+            ok = False
+        sent += 1
+    return {"ok": ok, "pages": len(pages), "sent": sent, "delivered": delivered,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+def dispatch_channel_jobs(jobs, push_timeout) -> dict:
+    """
+    并行推送到各个渠道，每个渠道最多耗时 push_timeout 秒
+    所有渠道完成或超时后立即返回，不等待未完成的渠道
+    """
+    if not jobs:
+        return {}
+    start = time.perf_counter()
+    deadline = start + push_timeout
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs))
+    futures = {executor.submit(_deliver_channel, send_page, pages, deadline): name
+               for name, send_page, pages in jobs}
+    # 单个请求的超时时间不超过剩余时间，这里额外等待1秒用于收尾
+    done, not_done = concurrent.futures.wait(futures, timeout=push_timeout + 1)
+    executor.shutdown(wait=False, cancel_futures=True)
+    channel_results = dict()
+    for future, name in futures.items():
+        if future in done and future.exception() is None:
+            channel_results[name] = future.result()
+        else:
+            channel_results[name] = {"ok": False, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                                     "error": "timeout" if future in not_done else str(future.exception())}
+    for name, result in channel_results.items():
+        status = "成功" if result["ok"] else "失败"
+        print(f"{name}推送{status}，耗时：{result['elapsed_ms']}ms")
+    return channel_results
 
 
 def not_in_push_time_range(config: PushConfig) -> bool:
@@ -171,57 +223,186 @@ def desensitize_account(account):
 
 
 # ========== 公共函数2：生成统一格式的推送内容 ==========
-def generate_unified_content(exec_results, summary):
-    """生成3种推送方式共用模板"""
-    success_count = sum(1 for res in exec_results if res.get("success") is True)
-    fail_count = len(exec_results) - success_count
+# 各推送渠道单条消息的长度上限
+PUSH_PLUS_MAX_LENGTH = 20000
+# 企业微信 markdown_v2 按UTF-8字节数限制
+WECHAT_MAX_BYTES = 4096
+TELEGRAM_MAX_LENGTH = 4096
+# 分页时为页码行预留的长度
+PAGE_MARK_RESERVED = 32
+STEP_RANGE_PATTERN = re.compile(r'(\d+-\d+)')
+
+
+def utf8_length(text) -> int:
+    return len(text.encode('utf-8'))
+
+
+def _truncate(text, limit, length_func=len) -> str:
+    """截断超长的单条内容，保证不超过limit"""
+    if length_func(text) <= limit:
+        return text
+    suffix = "...\n"
+    text = text[:max(limit - len(suffix), 0)]
+    while text and length_func(text) + length_func(suffix) > limit:
+        text = text[:-max((length_func(text) + length_func(suffix) - limit) // 4, 1)]
+    return text + suffix
+
+
+class PushReport:
+    """
+    一次执行的推送报告，只渲染一次
+    各推送渠道通过 pages 按自身的长度限制拆分为多条消息
+    """
+
+    def __init__(self, title, header, entries, omitted):
+        self.title = title
+        self.header = header
+        self.entries = entries
+        self.omitted = omitted
+
+    def to_dict(self) -> dict:
+        return {"title": self.title, "header": self.header, "entries": self.entries, "omitted": self.omitted}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["title"], data["header"], list(data.get("entries", [])), data.get("omitted", 0))
+
+    @classmethod
+    def coalesce(cls, reports):
+        """合并多次执行的报告为一条消息，按执行顺序展示，标题使用最近一次执行的结果"""
+        if len(reports) == 1:
+            return reports[0]
+        entries = []
+        for report in reports:
+            # 每次执行的概要作为单独的一段，分页时和账号结果一样不会被拆开
+            entries.append("\n" + report.header)
+            entries.extend(report._tail_parts(list(report.entries)))
+        title = f"{reports[-1].title}（合并{len(reports)}次执行）"
+        header = f"{title}\n以下为{len(reports)}次执行的报告，其中{len(reports) - 1}次之前未推送成功\n====================\n"
+        return cls(title, header, entries, 0)
+
+    def content(self) -> str:
+        """完整内容，不分页"""
+        return "".join(self._tail_parts([self.header, *self.entries]))
+
+    def _tail_parts(self, parts) -> list:
+        if self.omitted > 0:
+            parts.append(f"其余{self.omitted}个账号的结果已省略，完整结果请查看执行日志\n")
+        return parts
+
+    def pages(self, max_length, length_func=len, reserved=0) -> list:
+        """
+        按长度上限拆分为多页，每个账号的结果不会被拆开
+        reserved 为渠道在内容之外额外占用的长度，例如企业微信的标题
+        """
+        budget = max(max_length - reserved - PAGE_MARK_RESERVED, 1)
+        header = _truncate(self.header, budget, length_func)
+        groups = []
+        current, size = [header], length_func(header)
+        for entry in self._tail_parts(list(self.entries)):
+            entry = _truncate(entry, budget, length_func)
+            entry_length = length_func(entry)
+            if len(current) > 0 and size + entry_length > budget:
+                groups.append(current)
+                current, size = [], 0
+            current.append(entry)
+            size += entry_length
+        if current:
+            groups.append(current)
+        if len(groups) == 1:
+            return ["".join(groups[0])]
+        total = len(groups)
+        return [f"({page}/{total})\n" + "".join(group) for page, group in enumerate(groups, start=1)]
+
+
+def _format_entry(idx, exec_result) -> str:
+    safe_user = desensitize_account(exec_result.user)
+    res_msg = exec_result.msg
+    if exec_result.success:
+        return f"{idx}. ✅ 成功 | 账号：{safe_user}\n返回：{res_msg}\n----------------\n"
+    return f"{idx}. ❌ 失败 | 账号：{safe_user}\n返回：{res_msg}\n----------------\n"
+
+
+def render_report(exec_results, summary, max_entries=None) -> PushReport:
+    """
+    渲染推送报告
+    max_entries 为最多展示详情的账号数，超出时优先展示失败的账号，其余只计入概要
+    """
+    exec_results = list(exec_results)
+    total = len(exec_results)
+    success_count = sum(1 for res in exec_results if res.success)
+    fail_count = total - success_count
     exec_date, finish_time = format_date_hm()
-    step_range = re.search(r'(\d+-\d+)', summary).group(1) if re.search(r'(\d+-\d+)', summary) else "未知"
-    content = f"""成功{success_count}个 失败{fail_count}个
+    step_match = STEP_RANGE_PATTERN.search(summary)
+    step_range = step_match.group(1) if step_match else "未知"
+    success_rate = success_count / total * 100 if total > 0 else 0
+    title = f"成功{success_count}个 失败{fail_count}个"
+    header = f"""{title}
 {exec_date} 刷步报告 {finish_time}
 ====================
 ■ 执行日期：{exec_date}
 ■ 完成时间：{finish_time}
 ■ 步数范围：{step_range}
 ■ 同步结果：成功{success_count}个 | 失败{fail_count}个
-■ 成功率：{(success_count/len(exec_results)*100):.1f}%
+■ 成功率：{success_rate:.1f}%
 详细结果：
 ----------
 """
-    for idx, exec_result in enumerate(exec_results, start=1):
-        safe_user = desensitize_account(exec_result["user"])
-        res_msg = exec_result["msg"]
-        if exec_result.get("success") is True:
-            content += f"{idx}. ✅ 成功 | 账号：{safe_user}\n返回：{res_msg}\n----------------\n"
-        else:
-            content += f"{idx}. ❌ 失败 | 账号：{safe_user}\n返回：{res_msg}\n----------------\n"
-    return f"成功{success_count}个 失败{fail_count}个", content
+    selected = range(total)
+    if max_entries is not None and total > max_entries:
+        # 优先展示失败的账号，再用成功的账号补足，最后按原顺序展示
+        failed = [idx for idx, res in enumerate(exec_results) if not res.success]
+        succeeded = [idx for idx, res in enumerate(exec_results) if res.success]
+        selected = sorted((failed + succeeded)[:max(max_entries, 0)])
+    entries = [_format_entry(idx + 1, exec_results[idx]) for idx in selected]
+    return PushReport(title, header, entries, total - len(entries))
+
+
+def generate_unified_content(exec_results, summary):
+    """生成3种推送方式共用模板"""
+    report = render_report(exec_results, summary)
+    return report.title, report.content()
 
 
 # ========== 三种推送方式：统一调用公共生成函数 ==========
-def push_to_push_plus(exec_results, summary, config: PushConfig):
-    """推送到PushPlus"""
+def configured_channels(config: PushConfig, verbose=True) -> list:
+    """已配置的推送渠道名称，verbose 为 True 时输出未配置的渠道"""
+    channels = []
     if config.push_plus_token and config.push_plus_token != '' and config.push_plus_token != 'NO':
-        push_title, push_content = generate_unified_content(exec_results, summary)
-        push_plus(config.push_plus_token, push_title, push_content)
-    else:
+        channels.append("pushplus")
+    elif verbose:
         print("未配置 PUSH_PLUS_TOKEN 跳过PUSHPLUS推送")
-
-
-def push_to_wechat_webhook(exec_results, summary, config: PushConfig):
-    """推送到企业微信"""
     if config.push_wechat_webhook_key and config.push_wechat_webhook_key != '' and config.push_wechat_webhook_key != 'NO':
-        push_title, push_content = generate_unified_content(exec_results, summary)
-        push_wechat_webhook(config.push_wechat_webhook_key, push_title, push_content)
-    else:
+        channels.append("企业微信")
+    elif verbose:
         print("未配置 WECHAT_WEBHOOK_KEY 跳过微信推送")
-
-
-def push_to_telegram_bot(exec_results, summary, config: PushConfig):
-    """推送到Telegram"""
     if (config.telegram_bot_token and config.telegram_bot_token != '' and config.telegram_bot_token != 'NO' and
             config.telegram_chat_id and config.telegram_chat_id != ''):
-        push_title, push_content = generate_unified_content(exec_results, summary)
-        push_telegram_bot(config.telegram_bot_token, config.telegram_chat_id, push_content)
-    else:
-        print("未配置 TELEGRAM_BOT_TOKEN 或 TELEGRAM_CHAT_ID 跳过telegram推送")
\ No newline at end of file
+        channels.append("telegram")
+    elif verbose:
+        print("未配置 TELEGRAM_BOT_TOKEN 或 TELEGRAM_CHAT_ID 跳过telegram推送")
+    return channels
+
+
+def build_channel_job(name, report: PushReport, config: PushConfig):
+    """生成单个渠道的推送任务：(渠道名称, 发送单页的函数, 分页内容)"""
+    if name == "pushplus":
+        return (name,
+                lambda page, timeout: push_plus(config.push_plus_token, report.title, page, timeout),
+                report.pages(PUSH_PLUS_MAX_LENGTH))
+    if name == "企业微信":
+        reserved = utf8_length(buildWeChatContent(report.title, ""))
+        return (name,
+                lambda page, timeout: push_wechat_webhook(config.push_wechat_webhook_key, report.title, page, timeout),
+                report.pages(WECHAT_MAX_BYTES, utf8_length, reserved))
+    if name == "telegram":
+        return (name,
+                lambda page, timeout: push_telegram_bot(config.telegram_bot_token, config.telegram_chat_id, page,
+                                                        timeout),
+                report.pages(TELEGRAM_MAX_LENGTH))
+    raise ValueError(f"未知的推送渠道：{name}")
+
+
+def build_channel_jobs(report: PushReport, config: PushConfig) -> list:
+    """根据配置生成各渠道的推送任务"""
+    return [build_channel_job(name, report, config) for name in configured_channels(config)]
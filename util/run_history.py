@@ -0,0 +1,178 @@
+# -*- coding: utf8 -*-
+import hashlib
+import hmac
+import sqlite3
+import time
+
+# 需要重新登录的token层级：login_token或app_token都已失效
+RELOGIN_TIERS = ("access_token", "password")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    mode TEXT,
+    concurrency INTEGER,
+    shard TEXT,
+    accounts INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    interrupted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS account_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    account_key TEXT NOT NULL,
+    label TEXT,
+    success INTEGER NOT NULL,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    tier TEXT,
+    calls INTEGER NOT NULL DEFAULT 0,
+    elapsed_ms REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stage_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    stage TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    p50_ms REAL,
+    p90_ms REAL,
+    p99_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_account_runs_run ON account_runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_stage_runs_run ON stage_runs(run_id);
+"""
+
+
+def _account_label(account_key, label) -> str:
+    # 脱敏后的账号可能重复，附加账号标识的前几位用于区分
+    return f"{label}({account_key[:6]})" if label else account_key
+
+
+class RunHistory:
+    """
+    使用SQLite保存每次执行的记录，用于分析成功率和耗时的变化趋势
+      - runs: 每次执行一行，包含耗时、执行方式、并发数以及成功数
+      - account_runs: 每个账号每次执行一行，包含是否成功、最终使用的token层级、接口调用次数和耗时
+      - stage_runs: 每个接口阶段每次执行一行，包含调用次数、失败次数以及耗时百分位
+      - 账号只保存AES_KEY对账号做HMAC的结果以及脱敏后的账号，不保存账号本身
+        手机号的取值范围很小，不加密钥的摘要可以穷举还原，因此写入记录必须提供AES_KEY，只读取报告时不需要
+    """
+
+    def __init__(self, path, aes_key=None):
+        self.path = path
+        self.aes_key = aes_key
+
+    def _connect(self) -> sqlite3.Connection:
+        # 多个分片进程可能同时写入，等待其他进程释放锁
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def account_key(self, user) -> str:
+        if self.aes_key is None:
+            raise ValueError("保存执行记录需要配置AES_KEY")
+        return hmac.new(self.aes_key, user.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+
+    def record_run(self, run: dict, accounts: list, stages: dict) -> int:
+        """
+        保存一次执行的记录，返回执行记录的id
+
+        Args:
+            run: started/duration_ms/mode/concurrency/shard/interrupted
+            accounts: 每个账号的 user/label/success/skipped/tier/calls/elapsed_ms
+            stages: RunMetrics.stage_summary 的结果
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (started, duration_ms, mode, concurrency, shard, accounts, success, interrupted) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run.get("started", time.time()), run.get("duration_ms", 0), run.get("mode"),
+                     run.get("concurrency"), run.get("shard"), len(accounts),
+                     sum(1 for account in accounts if account["success"]), int(bool(run.get("interrupted")))))
+                run_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO account_runs (run_id, account_key, label, success, skipped, tier, calls, elapsed_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, self.account_key(account["user"]), account.get("label"), int(bool(account["success"])),
+                      int(bool(account.get("skipped"))), account.get("tier"), account.get("calls", 0),
+                      round(account.get("elapsed_ms", 0), 2)) for account in accounts])
+                conn.executemany(
+                    "INSERT INTO stage_runs (run_id, stage, count, errors, p50_ms, p90_ms, p99_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, stage, item["count"], item["count"] - item["status"].get("ok", 0),
+                      item["p50_ms"], item["p90_ms"], item["p99_ms"]) for stage, item in stages.items()])
+            return run_id
+        finally:
+            conn.close()
+
+    def report(self, runs=20, top=10) -> str:
+        """最近 runs 次执行的成功率和耗时趋势、最慢的账号以及经常需要重新登录的账号"""
+        conn = self._connect()
+        try:
+            return "\n".join(self._report_runs(conn, runs) + self._report_stages(conn, runs)
+                             + self._report_slowest(conn, runs, top) + self._report_relogin(conn, runs, top))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _recent_filter(runs) -> str:
+        return f"run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT {int(runs)})"
+
+    @staticmethod
+    def _report_runs(conn, runs) -> list:
+        rows = conn.execute("SELECT id, started, duration_ms, mode, concurrency, shard, accounts, success, interrupted "
+                            "FROM runs ORDER BY id DESC LIMIT ?", (runs,)).fetchall()
+        lines = [f"最近{len(rows)}次执行："]
+        if len(rows) <= 1:
+            lines.append("  只有一次执行记录，无法看出趋势。数据库不会提交到仓库，Github Actions中每次执行都是新的数据库，"
+                         "趋势报告只适用于本地或守护模式(--daemon)执行")
+        for run_id, started, duration_ms, mode, concurrency, shard, accounts, success, interrupted in reversed(rows):
+            rate = success / accounts * 100 if accounts else 0
+            lines.append(f"  #{run_id:<5} {time.strftime('%Y-%m-%d %H:%M', time.localtime(started))} "
+                         f"{mode or '-':<8} 并发:{concurrency or '-':<4} 账号:{accounts:<6} 成功率:{rate:6.1f}% "
+                         f"耗时:{duration_ms / 1000:8.1f}s" + (f" 分片:{shard}" if shard else "")
+                         + (" 被中断" if interrupted else ""))
+        return lines
+
+    def _report_stages(self, conn, runs) -> list:
+        rows = conn.execute(f"SELECT stage, run_id, p50_ms, count, errors FROM stage_runs "
+                            f"WHERE {self._recent_filter(runs)} ORDER BY stage, run_id").fetchall()
+        stages = dict()
+        for stage, run_id, p50_ms, count, errors in rows:
+            stages.setdefault(stage, []).append((p50_ms, count, errors))
+        lines = ["", "各阶段p50耗时趋势(ms，前半段平均 -> 后半段平均)："]
+        for stage, items in stages.items():
+            half = max(len(items) // 2, 1)
+            before = sum(item[0] for item in items[:half]) / half
+            after = sum(item[0] for item in items[-half:]) / half
+            calls = sum(item[1] for item in items)
+            errors = sum(item[2] for item in items)
+            change = (after - before) / before * 100 if before else 0
+            lines.append(f"  {stage:<20} {before:9.1f} -> {after:9.1f} ({change:+6.1f}%) "
+                         f"调用:{calls:<7} 失败率:{errors / calls * 100 if calls else 0:5.1f}%")
+        return lines
+
+    def _report_slowest(self, conn, runs, top) -> list:
+        rows = conn.execute(f"SELECT account_key, MAX(label), AVG(elapsed_ms), AVG(calls), COUNT(*) FROM account_runs "
+                            f"WHERE {self._recent_filter(runs)} AND skipped = 0 "
+                            f"GROUP BY account_key ORDER BY AVG(elapsed_ms) DESC LIMIT ?", (top,)).fetchall()
+        lines = ["", f"平均接口耗时最长的{len(rows)}个账号："]
+        for account_key, label, elapsed_ms, calls, count in rows:
+            lines.append(f"  {_account_label(account_key, label):<24} 平均耗时:{elapsed_ms:9.1f}ms "
+                         f"平均调用:{calls:5.1f}次 执行:{count}次")
+        return lines
+
+    def _report_relogin(self, conn, runs, top) -> list:
+        placeholders = ",".join("?" for _ in RELOGIN_TIERS)
+        rows = conn.execute(f"SELECT account_key, MAX(label), SUM(tier IN ({placeholders})), "
+                            f"SUM(success = 0), COUNT(*) FROM account_runs "
+                            f"WHERE {self._recent_filter(runs)} GROUP BY account_key "
+                            f"HAVING SUM(tier IN ({placeholders})) > 0 "
+                            f"ORDER BY SUM(tier IN ({placeholders})) DESC LIMIT ?",
+                            RELOGIN_TIERS * 3 + (top,)).fetchall()
+        lines = ["", f"需要重新登录次数最多的{len(rows)}个账号："]
+        for account_key, label, relogin, failed, count in rows:
+            lines.append(f"  {_account_label(account_key, label):<24} 重新登录:{relogin}次 失败:{failed}次 执行:{count}次")
+        return lines
@@ -0,0 +1,61 @@
+# -*- coding: utf8 -*-
+import os
+
+from util.token_store import TokenStore
+
+# 执行日志的文件头，和token文件使用同样的按账号加密追加写入格式
+JOURNAL_HEADER = "MIMOTION-RUN-JOURNAL-V1"
+
+
+class RunJournal:
+    """
+    记录每个账号执行结果的日志，用于执行中途被中断后续跑
+      - 每个账号执行结束后立即追加写入一条加密记录，进程被杀也只丢失正在执行的账号
+      - 记录中保存执行日期，续跑时只使用当天的记录，日期不同的日志整体丢弃
+      - 非续跑模式启动时清空日志，续跑模式跳过当天已成功的账号，失败的账号重新执行
+      - 全部账号执行完成后删除日志，只有被中断的执行才会留下日志文件
+      - path 为 None 时仅在内存中保存，用于未配置AES_KEY的情况，此时无法续跑
+    """
+
+    def __init__(self, path, aes_key, date):
+        self.path = path
+        self.aes_key = aes_key
+        self.date = date
+        self._store = TokenStore(path, aes_key, JOURNAL_HEADER)
+
+    def start(self, resume=False):
+        """开始一次执行，resume 为 True 时读取当天已有的记录"""
+        if self.path is None:
+            return self
+        if resume:
+            self._store.load()
+            records = self._store.values()
+            if all(record.get("date") == self.date for record in records):
+                return self
+            print("执行日志不是今天的，忽略已有记录")
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._store = TokenStore(self.path, self.aes_key, JOURNAL_HEADER)
+        return self
+
+    def finish(self):
+        """执行完成，删除日志文件"""
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def completed_result(self, user) -> dict | None:
+        """账号今天已经执行成功时返回当时的执行结果"""
+        record = self._store.get(user)
+        if record is None or record.get("date") != self.date:
+            return None
+        result = record.get("result")
+        if result is None or result.get("success") is not True:
+            return None
+        return result
+
+    def record(self, user, result: dict):
+        """记录账号的执行结果并立即追加写入文件"""
+        self._store.put(user, {"date": self.date, "result": result})
+
+    def __len__(self):
+        return len(self._store)
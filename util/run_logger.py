@@ -0,0 +1,73 @@
+# -*- coding: utf8 -*-
+import json
+import queue
+import sys
+import threading
+
+from util.clock import format_now
+
+# 队列长度上限，写出跟不上时执行账号的线程等待
+MAX_QUEUE_SIZE = 256
+
+
+class RunLogger:
+    """
+    按账号输出执行日志
+      - 执行线程只把日志放入队列，由单独的线程写出，每个账号的日志作为一个完整的块输出，多线程执行时不会交错
+      - 标准输出为便于阅读的文本块，配置了 path 时同时以JSON Lines格式写入文件，每个账号一行
+      - 队列有长度上限，日志写出后即释放，内存占用不随账号数增长
+    """
+
+    def __init__(self, path=None, max_queue=MAX_QUEUE_SIZE):
+        self.path = path
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._thread = None
+
+    def start(self):
+        if self.path is not None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._write_loop, name="run-logger", daemon=True)
+        self._thread.start()
+        return self
+
+    def account(self, idx_info, label, lines, result):
+        """记录一个账号的日志，result 为 AccountResult"""
+        self._queue.put((format_now(), idx_info, label, lines, result))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                print(f"写出执行日志失败：{e}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, now, idx_info, label, lines, result):
+        text = "\n".join([f"[{now}]", f"{idx_info}账号：{label}"] + lines)
+        sys.stdout.write(text + "\n\n")
+        sys.stdout.flush()
+        if self._file is not None:
+            record = {"time": now, "account": f"{idx_info}{label}", "success": result.success,
+                      "error": result.error, "skipped": result.skipped, "msg": result.msg, "log": lines}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def flush(self):
+        """等待队列中的日志全部写出"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,129 @@
+# -*- coding: utf8 -*-
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+def percentile(values, pct) -> float:
+    """最近秩法计算百分位数，values需已排序"""
+    if not values:
+        return 0.0
+    idx = min(max(math.ceil(pct / 100 * len(values)) - 1, 0), len(values) - 1)
+    return values[idx]
+
+
+class Span:
+    """单次接口调用的耗时记录"""
+    __slots__ = ("stage", "host", "tier", "account", "status", "start", "elapsed")
+
+    def __init__(self, stage, host, tier, account):
+        self.stage = stage
+        self.host = host
+        self.tier = tier
+        self.account = account
+        self.status = "ok"
+        self.start = time.time()
+        self.elapsed = 0.0
+
+    def to_dict(self) -> dict:
+        return {"stage": self.stage, "host": self.host, "tier": self.tier, "account": self.account,
+                "status": self.status, "start": round(self.start, 3), "elapsed_ms": round(self.elapsed * 1000, 2)}
+
+
+class RunMetrics:
+    """
+    记录每个账号各阶段的接口耗时
+      - stage: 阶段名称，例如 check_app_token、band_data
+      - host: 请求的接口域名
+      - tier: 本次使用的token层级 app_token/login_token/access_token/password
+      - status: ok 成功，fail 接口返回失败，error 请求异常，circuit_open 接口已熔断未发起请求，deadline 超过执行时限
+    执行结束后按阶段输出耗时百分位，并可导出为JSON
+    """
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    @contextmanager
+    def span(self, stage, host, tier=None, account=None):
+        # 去掉协议部分，保留域名以及本地模拟服务时的路径前缀
+        host = host.split("://", 1)[-1]
+        span = Span(stage, host, tier, account)
+        begin = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            # 调用方已经标记了更具体的状态时保留，例如 circuit_open
+            if span.status == "ok":
+                span.status = "error"
+            raise
+        finally:
+            span.elapsed = time.perf_counter() - begin
+            with self._lock:
+                self._spans.append(span)
+
+    def stage_summary(self) -> dict:
+        with self._lock:
+            spans = list(self._spans)
+        stages = dict()
+        for span in spans:
+            stages.setdefault(span.stage, []).append(span)
+        summary = dict()
+        for stage, stage_spans in stages.items():
+            elapsed = sorted(span.elapsed * 1000 for span in stage_spans)
+            statuses = dict()
+            for span in stage_spans:
+                statuses[span.status] = statuses.get(span.status, 0) + 1
+            summary[stage] = {
+                "count": len(elapsed),
+                "status": statuses,
+                "host": stage_spans[0].host,
+                "p50_ms": round(percentile(elapsed, 50), 2),
+                "p90_ms": round(percentile(elapsed, 90), 2),
+                "p99_ms": round(percentile(elapsed, 99), 2),
+                "max_ms": round(elapsed[-1], 2),
+                "total_ms": round(sum(elapsed), 2),
+            }
+        return summary
+
+    def account_summary(self) -> dict:
+        """按账号序号汇总接口调用次数、耗时以及最终使用的token层级"""
+        with self._lock:
+            spans = list(self._spans)
+        accounts = dict()
+        for span in spans:
+            if span.account is None:
+                continue
+            item = accounts.setdefault(span.account, {"calls": 0, "elapsed_ms": 0.0, "tier": None})
+            item["calls"] += 1
+            item["elapsed_ms"] += span.elapsed * 1000
+            # 提交步数时使用的token层级即为本次登录最终使用的层级
+            if span.stage == "band_data" or item["tier"] is None:
+                item["tier"] = span.tier
+        return accounts
+
+    def format_summary(self) -> str:
+        lines = ["各阶段耗时统计(ms)："]
+        for stage, item in self.stage_summary().items():
+            statuses = " ".join(f"{k}:{v}" for k, v in item["status"].items())
+            lines.append(f"  {stage:<20} 次数:{item['count']:<6} p50:{item['p50_ms']:<9} p90:{item['p90_ms']:<9} "
+                         f"p99:{item['p99_ms']:<9} max:{item['max_ms']:<9} [{statuses}]")
+        return "\n".join(lines)
+
+    def to_dict(self, include_spans=True) -> dict:
+        data = {
+            "started": round(self.started, 3),
+            "duration_ms": round((time.time() - self.started) * 1000, 2),
+            "stages": self.stage_summary(),
+        }
+        if include_spans:
+            with self._lock:
+                data["spans"] = [span.to_dict() for span in self._spans]
+        return data
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
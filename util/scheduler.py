@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+from datetime import timedelta
+
+# 未配置执行时间时使用的北京时间，和 run.yml 中的 cron '43 0,4,8 * * *' 一致
+DEFAULT_SCHEDULE = ((8, 43), (12, 43), (16, 43))
+# 根据 HOUR_STEP_RANGES 生成执行时间时，在每个区间开始后的这个分钟执行
+RANGE_START_MINUTE = 5
+
+
+def parse_schedule(text) -> list:
+    """
+    解析执行时间配置，格式为逗号分隔的北京时间 `HH:MM`，只有小时时分钟为0
+    例如 "8:43,12:43,22" -> [(8, 43), (12, 43), (22, 0)]
+    """
+    schedule = set()
+    for item in str(text).split(","):
+        item = item.strip()
+        if not item:
+            continue
+        hour, _, minute = item.partition(":")
+        hour, minute = int(hour), int(minute or 0)
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"执行时间格式不正确：{item}，请使用 HH:MM")
+        schedule.add((hour, minute))
+    if not schedule:
+        raise ValueError(f"执行时间格式不正确：{text}，请使用逗号分隔的 HH:MM")
+    return sorted(schedule)
+
+
+def schedule_from_hour_ranges(hour_step_ranges) -> list:
+    """使用 HOUR_STEP_RANGES 中每个区间的开始时间作为执行时间"""
+    return sorted(set((int(start_h) % 24, RANGE_START_MINUTE) for start_h, _, _, _ in hour_step_ranges))
+
+
+def next_run_time(schedule, now):
+    """now 之后的下一个执行时间，now 为带时区的 datetime"""
+    for day in range(2):
+        date = now + timedelta(days=day)
+        for hour, minute in schedule:
+            candidate = date.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if candidate > now:
+                return candidate
+    raise ValueError("执行时间不能为空")
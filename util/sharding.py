@@ -0,0 +1,100 @@
+# -*- coding: utf8 -*-
+import hashlib
+import json
+import os
+
+from util.aes_help import encrypt_data, decrypt_data, bytes_to_base64, base64_to_bytes
+
+# 各分片执行结果的保存目录，合并后删除
+SHARD_RESULT_DIR = "shard_results"
+# 分片结果文件头，之后一行为加密后的结果
+SHARD_RESULT_HEADER = "MIMOTION-SHARD-RESULT-V1"
+
+
+def parse_shard(spec) -> (int, int):
+    """解析 `i/n` 格式的分片参数，i 从1开始"""
+    try:
+        index, count = (int(x) for x in spec.split('/'))
+    except (AttributeError, ValueError):
+        raise ValueError(f"分片参数格式应为 i/n，例如 1/4：{spec}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号需要在1到{count}之间：{spec}")
+    return index, count
+
+
+def shard_of(user, count) -> int:
+    """按账号的稳定哈希计算所在分片，和账号在CONFIG中的顺序以及Python的hash随机化无关"""
+    digest = hashlib.sha256(user.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def shard_suffix(index, count) -> str:
+    return f"shard-{index}-of-{count}"
+
+
+def segment_path(path, index, count) -> str:
+    """分片使用的文件路径，例如 encrypted_tokens.data -> encrypted_tokens.shard-1-of-4.data"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{shard_suffix(index, count)}{ext}"
+
+
+def list_segments(path) -> list:
+    """列出 path 对应的所有分片文件"""
+    root, ext = os.path.splitext(path)
+    directory = os.path.dirname(root) or "."
+    prefix = os.path.basename(root) + ".shard-"
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith(prefix) and name.endswith(ext))
+
+
+def write_shard_result(index, count, total, results, aes_key, extra=None, result_dir=SHARD_RESULT_DIR) -> str:
+    """
+    使用AES_KEY加密保存分片的执行结果，结果中包含账号，会作为Actions的artifact上传
+
+    Args:
+        results: (账号在CONFIG中的序号, 执行结果字典) 列表，合并时据此恢复原始顺序
+        extra: 需要一起合并的其他数据，例如token生命周期观测
+    """
+    os.makedirs(result_dir, exist_ok=True)
+    path = os.path.join(result_dir, f"{shard_suffix(index, count)}.data")
+    data = {"index": index, "count": count, "total": total,
+            "results": [[idx, result] for idx, result in results]}
+    if extra:
+        data.update(extra)
+    origin_str = json.dumps(data, ensure_ascii=False)
+    cipher = bytes_to_base64(encrypt_data(origin_str.encode('utf-8'), aes_key, None))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(SHARD_RESULT_HEADER + '\n' + cipher + '\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def _read_shard_result(path, aes_key) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        header, _, cipher = f.read().partition('\n')
+    if header != SHARD_RESULT_HEADER:
+        raise ValueError(f"{path} 不是分片结果文件")
+    return json.loads(decrypt_data(base64_to_bytes(cipher.strip()), aes_key, None).decode('utf-8'))
+
+
+def load_shard_results(aes_key, result_dir=SHARD_RESULT_DIR) -> (list, list, list):
+    """
+    读取并解密所有分片结果
+
+    Returns:
+        按账号原始顺序排列的结果列表、各分片的原始数据、缺失的分片序号
+    """
+    shards = []
+    if os.path.isdir(result_dir):
+        for name in sorted(os.listdir(result_dir)):
+            if name.startswith("shard-") and name.endswith(".data"):
+                shards.append(_read_shard_result(os.path.join(result_dir, name), aes_key))
+    if not shards:
+        return [], [], []
+    count = shards[0]["count"]
+    if any(shard["count"] != count for shard in shards):
+        raise ValueError(f"{result_dir} 中存在分片数不一致的结果，请清理后重新执行")
+    missing = sorted(set(range(1, count + 1)) - set(shard["index"] for shard in shards))
+    results = sorted((item for shard in shards for item in shard["results"]), key=lambda item: item[0])
+    return [result for _, result in results], shards, missing
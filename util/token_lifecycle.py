@@ -0,0 +1,212 @@
+# -*- coding: utf8 -*-
+import json
+import os
+import threading
+import time
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# 各级token的默认有效期估计值，没有观测数据时使用，取值偏保守
+DEFAULT_LIFETIMES = {
+    "app_token": 12 * HOUR_MS,
+    "login_token": 30 * DAY_MS,
+    "access_token": 90 * DAY_MS,
+}
+# 签发时间在有效期估计值的这个比例以内时直接信任，不再请求接口校验
+TRUST_RATIO = 0.5
+# 签发时间超过有效期估计值的这个比例时提前续期login_token
+RENEW_RATIO = 0.8
+# 每级token最多保留的有效/失效观测数量，旧的观测逐渐被新的替代
+MAX_OBSERVATIONS = 50
+# 失效观测达到这个数量后才用观测值代替默认有效期，避免个别提前失效的token(例如修改了密码)拉低估计值
+MIN_INVALID_SAMPLES = 5
+# 使用失效时长的这个分位数估计有效期，失效后才会被观测到，观测值偏长，取较低的分位数
+INVALID_PERCENTILE = 0.25
+# 有效期估计值不低于默认有效期的这个比例
+MIN_LIFETIME_RATIO = 0.25
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class TokenLifecycle:
+    """
+    token生命周期管理
+      - 根据保存的 *_token_time 字段计算token已签发时长
+      - 记录每级token被判定有效/失效时的时长，以失效时长的中位数估计有效期
+      - 失效观测足够多时才以低分位数估计有效期，且不低于默认有效期的一定比例，个别提前失效的token不影响估计
+      - 有效时长只保留比当前估计值更长的观测，失效观测表明有效期变短时丢弃更长的有效时长，服务端缩短有效期后估计值随之下降
+      - 观测数据没有变化时不写入文件，签发不久直接信任的token不产生观测
+      - 签发不久的token直接信任，跳过校验请求；login_token临近过期时提前续期
+      - 统计每级token节省的网络请求数
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        # tier -> 失效时观测到的签发时长列表
+        self._invalid_ages = {tier: [] for tier in DEFAULT_LIFETIMES}
+        # tier -> 最近观测到仍然有效的签发时长列表
+        self._valid_ages = {tier: [] for tier in DEFAULT_LIFETIMES}
+        self._stats = {tier: {"trusted": 0, "checked": 0, "renewed": 0, "saved_calls": 0}
+                       for tier in DEFAULT_LIFETIMES}
+        # 本次执行新增的观测，分片执行时由合并步骤汇总到同一个文件
+        self._new_invalid_ages = {tier: [] for tier in DEFAULT_LIFETIMES}
+        self._new_valid_ages = {tier: [] for tier in DEFAULT_LIFETIMES}
+        # 观测数据是否有变化，没有变化时不写入文件
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """读取历史观测数据，文件不存在或损坏时使用默认值"""
+        if self.path is None or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for tier in DEFAULT_LIFETIMES:
+                tier_data = data.get(tier, {})
+                self._invalid_ages[tier] = [int(age) for age in tier_data.get("invalid_ages", [])][-MAX_OBSERVATIONS:]
+                valid_ages = tier_data.get("valid_ages")
+                if valid_ages is None:
+                    # 旧版本只保存了最大有效时长
+                    valid_ages = [tier_data["max_valid_age"]] if tier_data.get("max_valid_age") else []
+                self._valid_ages[tier] = [int(age) for age in valid_ages][-MAX_OBSERVATIONS:]
+        except Exception as e:
+            print(f"读取token生命周期数据失败，使用默认值: {e}")
+        return self
+
+    def save(self) -> bool:
+        """保存观测数据，没有新的观测时不写入，返回是否写入了文件"""
+        if self.path is None:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {tier: {"invalid_ages": self._invalid_ages[tier],
+                           "valid_ages": self._valid_ages[tier],
+                           "estimated_lifetime": self._estimate(tier)}
+                    for tier in DEFAULT_LIFETIMES}
+            self._dirty = False
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return True
+
+    @staticmethod
+    def age_of(token_time) -> int | None:
+        """根据保存的token时间戳(毫秒字符串)计算已签发时长"""
+        if token_time is None or token_time == '':
+            return None
+        try:
+            return max(_now_ms() - int(token_time), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def _invalid_estimate(self, tier) -> int | None:
+        """根据失效观测估计的有效期，观测数量不足时为None"""
+        invalid_ages = sorted(self._invalid_ages[tier])
+        if len(invalid_ages) < MIN_INVALID_SAMPLES:
+            return None
+        estimate = invalid_ages[int(len(invalid_ages) * INVALID_PERCENTILE)]
+        return max(estimate, int(DEFAULT_LIFETIMES[tier] * MIN_LIFETIME_RATIO))
+
+    def _estimate(self, tier) -> int:
+        estimate = self._invalid_estimate(tier)
+        if estimate is None:
+            estimate = DEFAULT_LIFETIMES[tier]
+        # 最近在更长的时长下仍然有效，说明有效期至少这么长
+        return max([estimate] + self._valid_ages[tier])
+
+    def estimated_lifetime(self, tier) -> int:
+        with self._lock:
+            return self._estimate(tier)
+
+    def is_fresh(self, tier, token_time) -> bool:
+        """token签发时间足够近，可以不经校验直接使用"""
+        age = self.age_of(token_time)
+        if age is None:
+            return False
+        with self._lock:
+            return age < self._estimate(tier) * TRUST_RATIO
+
+    def needs_renew(self, tier, token_time) -> bool:
+        """token临近过期，需要提前续期"""
+        age = self.age_of(token_time)
+        if age is None:
+            return False
+        with self._lock:
+            return age >= self._estimate(tier) * RENEW_RATIO
+
+    def observe(self, tier, token_time, valid: bool):
+        """记录一次通过接口得到的token有效性结果，只应在接口明确返回有效或失效时调用"""
+        age = self.age_of(token_time)
+        with self._lock:
+            self._stats[tier]["checked"] += 1
+            if age is None:
+                return
+            if valid:
+                self._new_valid_ages[tier].append(age)
+            else:
+                self._new_invalid_ages[tier].append(age)
+            self._add_observation(tier, age, valid)
+
+    def _add_observation(self, tier, age, valid):
+        if valid:
+            if age <= self._estimate(tier):
+                # 不超过当前估计值的有效时长不会改变估计值，不保存
+                return
+            ages = self._valid_ages[tier]
+        else:
+            ages = self._invalid_ages[tier]
+        ages.append(age)
+        del ages[:-MAX_OBSERVATIONS]
+        self._dirty = True
+        limit = None if valid else self._invalid_estimate(tier)
+        if limit is not None:
+            # 足够多的失效观测比之前的有效时长还短，说明有效期已经变短，之前的有效观测不再可信
+            self._valid_ages[tier] = [valid_age for valid_age in self._valid_ages[tier] if valid_age <= limit]
+
+    def delta(self) -> dict:
+        """本次执行新增的观测数据"""
+        with self._lock:
+            return {tier: {"invalid_ages": self._new_invalid_ages[tier][-MAX_OBSERVATIONS:],
+                           "valid_ages": self._new_valid_ages[tier][-MAX_OBSERVATIONS:]}
+                    for tier in DEFAULT_LIFETIMES}
+
+    def merge_delta(self, delta: dict):
+        """合并其他进程通过 delta 导出的观测数据"""
+        with self._lock:
+            for tier in DEFAULT_LIFETIMES:
+                tier_data = delta.get(tier, {})
+                for age in tier_data.get("valid_ages", []):
+                    self._add_observation(tier, int(age), True)
+                for age in tier_data.get("invalid_ages", []):
+                    self._add_observation(tier, int(age), False)
+
+    def record_trusted(self, tier, saved_calls=1):
+        """记录一次跳过校验直接信任token"""
+        with self._lock:
+            self._stats[tier]["trusted"] += 1
+            self._stats[tier]["saved_calls"] += saved_calls
+
+    def record_renewed(self, tier, saved_calls=0):
+        """记录一次token续期，saved_calls为避免的下一级登录请求数"""
+        with self._lock:
+            self._stats[tier]["renewed"] += 1
+            self._stats[tier]["saved_calls"] += saved_calls
+
+    def reset_stats(self):
+        """清空本次执行的统计，守护模式下每次执行前调用，观测到的有效期数据保留"""
+        with self._lock:
+            self._stats = {tier: {"trusted": 0, "checked": 0, "renewed": 0, "saved_calls": 0}
+                           for tier in DEFAULT_LIFETIMES}
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = ["token生命周期统计："]
+            for tier, stats in self._stats.items():
+                lifetime_hours = self._estimate(tier) / HOUR_MS
+                lines.append(f"  {tier}: 估计有效期{lifetime_hours:.1f}小时 校验{stats['checked']}次 "
+                             f"直接信任{stats['trusted']}次 续期{stats['renewed']}次 节省请求{stats['saved_calls']}次")
+            return "\n".join(lines)
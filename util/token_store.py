@@ -0,0 +1,262 @@
+# -*- coding: utf8 -*-
+import hashlib
+import hmac
+import json
+import os
+import threading
+
+from util.aes_help import encrypt_data, decrypt_data, bytes_to_base64, base64_to_bytes
+
+# 新格式文件头，不以此开头的文件视为旧版整体加密的token数据
+STORE_HEADER = "MIMOTION-TOKENS-V1"
+
+
+class TokenStore:
+    """
+    按账号单独加密保存token的存储
+      - 文件为追加写入的日志：第一行为文件头，之后每行一条记录 `账号标识\\t加密内容`
+      - 账号标识为AES_KEY对账号做HMAC的结果，不会明文暴露账号
+      - 同一账号以最后一条记录为准，启动时只读取密文，用到哪个账号才解密哪个
+        最后一条记录无法解密时(例如只写了一半)依次使用之前的记录
+      - 每次登录成功后立即追加写入，进程中途被杀也不会丢失已刷新的token
+      - compact 时去掉被覆盖的旧记录以及不在CONFIG中的账号，只复制密文不重新加密
+        旧记录不多时跳过压缩，每次执行的写入量只和实际刷新token的账号数相关
+      - 内存中记录每个账号上次保存内容的摘要，内容没有变化时不追加写入，避免每次执行都因为随机IV产生新的密文
+      - path 为 None 时仅在内存中保存，用于未配置AES_KEY的情况
+    """
+
+    def __init__(self, path, aes_key, header=STORE_HEADER):
+        self.path = path
+        self.aes_key = aes_key
+        # 文件头，其他需要按账号加密追加写入的数据可以使用不同的文件头复用这个格式
+        self.header = header
+        # 账号标识 -> base64密文，尚未解密
+        self._records = dict()
+        # 账号标识 -> 被覆盖的旧密文，从旧到新，最新的记录无法解密时使用
+        self._previous = dict()
+        # 账号标识 -> 已解密或新写入的token信息
+        self._cache = dict()
+        # 账号标识 -> 上次保存的明文摘要，只保存在内存中
+        self._digests = dict()
+        # 本次执行中内容发生变化的账号
+        self._changed = dict()
+        # 日志中被后续记录覆盖的旧记录数量
+        self._stale = 0
+        # 旧版整体加密文件，需要在第一次写入前转换为新格式
+        self._legacy = False
+        self._lock = threading.Lock()
+
+    def _key(self, user) -> str:
+        if self.aes_key is None:
+            return user
+        return hmac.new(self.aes_key, user.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+    def load(self):
+        """读取文件中的记录，只做拆分不做解密"""
+        if self.path is None or not os.path.exists(self.path):
+            return self
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(self.header.encode('utf-8')):
+            self._load_legacy(data)
+            return self
+        for line in data.decode('utf-8', errors='replace').splitlines()[1:]:
+            key, sep, cipher = line.partition('\t')
+            if not sep or not cipher:
+                # 最后一行可能因为进程被杀只写了一半，直接忽略
+                continue
+            if key in self._records:
+                self._stale += 1
+                self._previous.setdefault(key, []).append(self._records[key])
+            self._records[key] = cipher
+        return self
+
+    def _load_legacy(self, data):
+        self._legacy = True
+        try:
+            decrypted_data = decrypt_data(data, self.aes_key, None)
+            legacy_tokens = json.loads(decrypted_data.decode('utf-8', errors='strict'))
+        except:
+            print("密钥不正确或者加密内容损坏 放弃token")
+            return
+        for user, token_info in legacy_tokens.items():
+            key = self._key(user)
+            self._cache[key] = token_info
+            self._digests[key] = self._digest(token_info)
+
+    def get(self, user) -> dict | None:
+        """获取账号的token信息，首次访问时才解密"""
+        key = self._key(user)
+        with self._lock:
+            return self._get_by_key(key)
+
+    def values(self) -> list:
+        """解密并返回所有账号的记录"""
+        with self._lock:
+            values = [self._get_by_key(key) for key in self._all_keys()]
+        return [value for value in values if value is not None]
+
+    def _get_by_key(self, key) -> dict | None:
+        token_info = self._cache.get(key)
+        if token_info is not None:
+            return token_info
+        cipher = self._records.get(key)
+        if cipher is None:
+            return None
+        # 从最新的记录开始尝试，损坏的记录丢弃，使用之前有效的记录
+        candidates = self._previous.pop(key, []) + [cipher]
+        while candidates:
+            cipher = candidates.pop()
+            try:
+                plain = decrypt_data(base64_to_bytes(cipher), self.aes_key, None)
+                token_info = json.loads(plain.decode('utf-8'))
+                break
+            except:
+                continue
+        else:
+            print("密钥不正确或者加密内容损坏 放弃该账号token")
+            return None
+        if cipher != self._records[key]:
+            print("该账号最新的token记录已损坏，使用之前的记录")
+            self._records[key] = cipher
+        self._cache[key] = token_info
+        self._digests[key] = self._digest(token_info)
+        return token_info
+
+    @staticmethod
+    def _digest(token_info) -> str:
+        origin_str = json.dumps(token_info, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(origin_str.encode('utf-8')).hexdigest()
+
+    def put(self, user, token_info: dict):
+        """保存账号的token信息并立即追加写入文件，内容没有变化时不写入"""
+        key = self._key(user)
+        with self._lock:
+            digest = self._digest(token_info)
+            if self._digests.get(key) == digest:
+                # 调用方可能直接修改了get返回的对象，需要和上次保存的摘要比较而不是和缓存比较
+                self._cache[key] = token_info
+                return
+            self._digests[key] = digest
+            self._changed[key] = user
+            if self.path is None:
+                self._cache[key] = token_info
+                return
+            if self._legacy:
+                self._rewrite(None)
+            self._cache[key] = token_info
+            cipher = self._encrypt(token_info)
+            if key in self._records:
+                self._stale += 1
+            self._records[key] = cipher
+            self._previous.pop(key, None)
+            self._append(key, cipher)
+
+    def _encrypt(self, token_info) -> str:
+        origin_str = json.dumps(token_info, ensure_ascii=False)
+        return bytes_to_base64(encrypt_data(origin_str.encode('utf-8'), self.aes_key, None))
+
+    def _append(self, key, cipher):
+        if not os.path.exists(self.path):
+            with open(self.path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(self.header + '\n')
+        # 上次写入被中断时文件不以换行结尾，先补上换行，避免新记录接在半条记录后面
+        line = f"{key}\t{cipher}\n"
+        with open(self.path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = '\n' + line
+        with open(self.path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write(line)
+            f.flush()
+
+    def compact(self, active_users=None) -> bool:
+        """
+        压缩日志文件，只保留每个账号最新的记录
+        active_users 不为空时同时删除不在其中的账号
+        旧记录数量未超过有效记录数且没有需要删除的账号时不做任何写入，返回是否重写了文件
+        """
+        with self._lock:
+            if self.path is None:
+                return False
+            active_keys = None
+            if active_users is not None:
+                active_keys = set(self._key(user) for user in active_users)
+            pruned = 0
+            if active_keys is not None:
+                pruned = sum(1 for key in self._all_keys() if key not in active_keys)
+            if not self._legacy and pruned == 0 and self._stale < max(len(self._records), 1):
+                return False
+            self._rewrite(active_keys)
+            return True
+
+    def absorb(self, other, users=None) -> int:
+        """
+        从另一个存储复制记录，只复制密文不重新加密，两者需要使用同一个AES_KEY
+        users 不为空时只复制这些账号且不覆盖已有记录，用于初始化分片；为空时复制全部并覆盖，用于合并分片
+        返回复制的记录数
+        """
+        with other._lock:
+            # 先解密有旧记录的账号，复制的是可以解密的记录
+            for key in list(other._previous.keys()):
+                other._get_by_key(key)
+            ciphers = dict(other._records)
+            for key, token_info in other._cache.items():
+                if key not in ciphers:
+                    ciphers[key] = other._encrypt(token_info)
+        with self._lock:
+            if users is not None:
+                wanted = set(self._key(user) for user in users)
+                ciphers = {key: cipher for key, cipher in ciphers.items()
+                           if key in wanted and key not in self._all_keys()}
+            if not ciphers:
+                return 0
+            for key, cipher in ciphers.items():
+                self._records[key] = cipher
+                self._cache.pop(key, None)
+                self._digests.pop(key, None)
+            if self.path is not None:
+                self._rewrite(None)
+            return len(ciphers)
+
+    def changed_users(self) -> list:
+        """本次执行中保存内容发生变化的账号"""
+        with self._lock:
+            return list(self._changed.values())
+
+    def clear_changed(self):
+        """清空变化记录，守护模式下每次执行前调用"""
+        with self._lock:
+            self._changed.clear()
+
+    def _all_keys(self) -> set:
+        return set(self._records.keys()) | set(self._cache.keys())
+
+    def _rewrite(self, active_keys):
+        # 最新记录可能已损坏的账号先解密一次，重写时保留可以解密的记录
+        for key in list(self._previous.keys()):
+            self._get_by_key(key)
+        if self._legacy:
+            # 旧格式没有单独的密文，需要逐个账号加密一次
+            for key, token_info in self._cache.items():
+                self._records[key] = self._encrypt(token_info)
+            self._legacy = False
+        if active_keys is not None:
+            for key in list(self._records.keys()):
+                if key not in active_keys:
+                    self._records.pop(key)
+                    self._cache.pop(key, None)
+                    self._previous.pop(key, None)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(self.header + '\n')
+            for key, cipher in self._records.items():
+                f.write(f"{key}\t{cipher}\n")
+            f.flush()
+        os.replace(tmp_path, self.path)
+        self._stale = 0
+        self._previous.clear()
+
+    def __len__(self):
+        return len(self._all_keys())